@@ -0,0 +1,376 @@
+"""
+ASGI entry point for high-concurrency serving:
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+
+Countdown event streams, timer session long-polls, /time and
+/calculate/batch are served natively on the event loop, so an idle
+subscriber costs a coroutine instead of a worker.
+Batches above INLINE_BATCH_ROWS are solved in a process pool. Every other
+route runs the Flask app from web_app in the loop's thread pool, with
+streamed responses passed on chunk by chunk.
+"""
+import asyncio
+import itertools
+import json
+import math
+import multiprocessing
+import os
+import re
+import sys
+import time
+from urllib.parse import parse_qs
+from concurrent.futures import ProcessPoolExecutor
+
+from batch_requests import BATCH_FORMATS, batch_body, batch_targets, pooled_batch_body, record_invalid_rows
+from metrics import ERRORS, REQUEST_SECONDS, REQUESTS, STAGE_SECONDS
+from web_app import app as wsgi_app
+from response_formats import negotiate
+from timer_sessions import DEFAULT_WAIT, MAX_WAIT
+from web_app import countdowns, error_kind, parse_tick, sessions
+
+# Batches up to this many rows are solved on the event loop (well under a
+# millisecond); larger ones go to the process pool
+INLINE_BATCH_ROWS = 200
+# Solver processes for large batches; 0 solves everything on the loop
+SOLVER_WORKERS = int(os.environ.get('TICKBOMB_SOLVER_WORKERS', min(4, os.cpu_count() or 1)))
+# Largest request body read into memory
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+EVENTS_PATH = re.compile(r'^/countdown/([^/]+)/events$')
+SESSION_PATH = re.compile(r'^/sessions/([^/]+)$')
+JSON_HEADERS = [(b'content-type', b'application/json')]
+SSE_HEADERS = [(b'content-type', b'text/event-stream; charset=utf-8'),
+               (b'cache-control', b'no-cache'),
+               (b'x-accel-buffering', b'no')]
+
+
+class TickbombASGI:
+    """
+    ASGI application wrapping the Flask app
+
+    Args:
+        wsgi: Flask (WSGI) application for the routes not served natively
+        solver_workers: Size of the batch process pool
+    """
+
+    def __init__(self, wsgi, solver_workers=SOLVER_WORKERS):
+        self.wsgi = wsgi
+        self.solver_workers = solver_workers
+        self.pool = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        path = scope['path']
+        method = scope['method']
+        start = time.perf_counter()
+        if method == 'POST' and path == '/calculate/batch':
+            status = await self.calculate_batch(scope, receive, send)
+            self.record('calculate_batch', status, start)
+            return
+        match = EVENTS_PATH.match(path)
+        if method == 'GET' and match:
+            status = await self.countdown_events(match.group(1), receive, send)
+            self.record('countdown_events', status, start)
+            return
+        if method == 'GET' and path == '/time':
+            status = await self.server_time(scope, send)
+            self.record('server_time', status, start)
+            return
+        match = SESSION_PATH.match(path)
+        if method == 'GET' and match:
+            status = await self.get_session(match.group(1), scope, receive, send)
+            self.record('get_session', status, start)
+            return
+        await self.call_wsgi(scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if self.solver_workers > 0:
+                    # spawn: forking a process that already runs an event loop
+                    # and a thread pool is not safe
+                    self.pool = ProcessPoolExecutor(self.solver_workers,
+                                                    mp_context=multiprocessing.get_context('spawn'))
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.pool is not None:
+                    self.pool.shutdown(cancel_futures=True)
+                    self.pool = None
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    def record(endpoint, status, start):
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint)
+        REQUESTS.inc(endpoint, status)
+
+    async def calculate_batch(self, scope, receive, send):
+        try:
+            headers = dict(scope['headers'])
+            query = parse_qs(scope['query_string'].decode('latin1'))
+            fmt = negotiate(headers.get(b'accept', b'').decode('latin1'), query.get('format', [None])[0],
+                            BATCH_FORMATS)
+            data = json.loads(await read_body(receive))
+            rows, message = batch_targets(data)
+            if message is not None:
+                return await send_error(send, 'calculate_batch', 'validation', message)
+            tick = parse_tick(data)
+
+            if self.pool is None or len(rows) <= INLINE_BATCH_ROWS:
+                body, mimetype, invalid = batch_body(rows, tick, fmt)
+            else:
+                # The workers only import batch_requests, not web_app, and
+                # send their stage timings back to be recorded here
+                loop = asyncio.get_running_loop()
+                body, mimetype, invalid, stages = await loop.run_in_executor(
+                    self.pool, pooled_batch_body, rows, tick, fmt)
+                stages.replay(STAGE_SECONDS)
+            record_invalid_rows(invalid)
+        except BodyTooLarge as e:
+            return await send_error(send, 'calculate_batch', 'invalid_json', str(e), 413)
+        except json.JSONDecodeError as e:
+            # Same status as werkzeug's BadRequest from the Flask view
+            return await send_error(send, 'calculate_batch', 'invalid_json', str(e), 400)
+        except Exception as e:
+            return await send_error(send, 'calculate_batch', error_kind(e), str(e))
+
+        await send_response(send, 200, [(b'content-type', mimetype.encode())], body)
+        return 200
+
+    async def countdown_events(self, countdown_id, receive, send):
+        countdown = countdowns.get(countdown_id)
+        if countdown is None:
+            return await send_error(send, 'countdown_events', 'not_found', 'Countdown not found.', 404)
+
+        await send({'type': 'http.response.start', 'status': 200, 'headers': SSE_HEADERS})
+
+        async def pump():
+            async for chunk in countdown.astream():
+                await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+
+        # Stop streaming as soon as the subscriber goes away instead of at
+        # the next event
+        streaming = asyncio.ensure_future(pump())
+        watching = asyncio.ensure_future(wait_for_disconnect(receive))
+        try:
+            await asyncio.wait((streaming, watching), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (streaming, watching):
+                task.cancel()
+            await asyncio.gather(streaming, watching, return_exceptions=True)
+        return 200
+
+    async def server_time(self, scope, send):
+        receive_time = time.time()
+        query = parse_qs(scope['query_string'].decode('latin1'))
+        try:
+            client_time = float(query['client_time'][0])
+        except (KeyError, ValueError):
+            client_time = None
+        body = json.dumps({'client_time': client_time, 'receive': receive_time, 'send': time.time()})
+        await send_response(send, 200, JSON_HEADERS, body.encode())
+        return 200
+
+    async def get_session(self, session_id, scope, receive, send):
+        query = parse_qs(scope['query_string'].decode('latin1'))
+        try:
+            version = int(query['version'][0]) if 'version' in query else None
+            wait = float(query.get('wait', [DEFAULT_WAIT])[0])
+            if not math.isfinite(wait):
+                raise ValueError('wait must be a finite number of seconds')
+            wait = min(max(wait, 0), MAX_WAIT)
+        except ValueError as e:
+            return await send_error(send, 'get_session', 'invalid_input', str(e))
+
+        if version is None:
+            session = sessions.get(session_id)
+        else:
+            # Give up early if the client goes away mid-poll
+            waiting = asyncio.ensure_future(sessions.async_wait(session_id, version, wait))
+            watching = asyncio.ensure_future(wait_for_disconnect(receive))
+            await asyncio.wait((waiting, watching), return_when=asyncio.FIRST_COMPLETED)
+            watching.cancel()
+            if not waiting.done():
+                waiting.cancel()
+                await asyncio.gather(waiting, watching, return_exceptions=True)
+                return 499
+            await asyncio.gather(watching, return_exceptions=True)
+            session = waiting.result()
+        if session is None:
+            return await send_error(send, 'get_session', 'not_found', 'Session not found.', 404)
+        await send_response(send, 200, JSON_HEADERS, json.dumps(session.snapshot()).encode())
+        return 200
+
+    async def call_wsgi(self, scope, receive, send):
+        """
+        Run the Flask app for one request in the default thread pool
+        """
+        try:
+            body = await read_body(receive)
+        except BodyTooLarge as e:
+            await send_error(send, 'unknown', 'invalid_json', str(e), 413)
+            return
+        environ = build_environ(scope, body)
+        loop = asyncio.get_running_loop()
+        status, headers, result, chunks = await loop.run_in_executor(None, start_wsgi, self.wsgi, environ)
+        try:
+            if isinstance(chunks, list):
+                await send_response(send, status, headers, b''.join(chunks))
+                return
+            # Streamed body (/trajectory): send each chunk as the app yields
+            # it instead of buffering the whole response
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    break
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(None, result.close)
+
+
+class BodyTooLarge(Exception):
+    pass
+
+
+async def read_body(receive):
+    body = bytearray()
+    while True:
+        message = await receive()
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_BYTES:
+            raise BodyTooLarge('Request body too large.')
+        if not message.get('more_body'):
+            return bytes(body)
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def send_response(send, status, headers, body):
+    headers = headers + [(b'content-length', str(len(body)).encode())]
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def send_error(send, endpoint, kind, message, status=200):
+    """
+    Count an error and send the same JSON body as web_app.error_response
+    """
+    ERRORS.inc(endpoint, kind)
+    await send_response(send, status, JSON_HEADERS, json.dumps({'error': message, 'kind': kind}).encode())
+    return status
+
+
+def build_environ(scope, body):
+    """
+    PEP 3333 environ for an ASGI HTTP scope
+    """
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin1'),
+        'PATH_INFO': scope['path'].encode('utf8').decode('latin1'),
+        'QUERY_STRING': scope['query_string'].decode('latin1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': client[0],
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': _BodyReader(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin1')
+        value = value.decode('latin1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'content-length':
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
+
+
+def start_wsgi(wsgi, environ):
+    """
+    Call a WSGI app up to the start of its response
+
+    Returns:
+        (status code, ASGI header list, the app's iterable, body chunks):
+        the chunks are already collected in a list when the app sent a
+        Content-Length, otherwise an iterator to stream from
+    """
+    response = {}
+
+    def start_response(status, headers, exc_info=None):
+        response['status'] = int(status.split(' ', 1)[0])
+        response['sized'] = any(name.lower() == 'content-length' for name, value in headers)
+        response['headers'] = [(name.lower().encode('latin1'), value.encode('latin1'))
+                               for name, value in headers if name.lower() != 'content-length']
+
+    result = wsgi(environ, start_response)
+    chunks = iter(result)
+    if 'status' not in response:
+        # start_response may wait for the first chunk (PEP 3333)
+        chunks = itertools.chain([next(chunks, b'')], chunks)
+    if response['sized']:
+        try:
+            chunks = list(chunks)
+        except BaseException:
+            if hasattr(result, 'close'):
+                result.close()
+            raise
+    return response['status'], response['headers'], result, chunks
+
+
+class _BodyReader:
+    """
+    Minimal file-like wsgi.input over an in-memory body
+    """
+
+    def __init__(self, body):
+        self._body = body
+        self._pos = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self._body) - self._pos
+        chunk = self._body[self._pos:self._pos + size]
+        self._pos += len(chunk)
+        return chunk
+
+    def readline(self, size=-1):
+        end = self._body.find(b'\n', self._pos)
+        end = len(self._body) if end < 0 else end + 1
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        return self.read(end - self._pos)
+
+    def __iter__(self):
+        while True:
+            line = self.readline()
+            if not line:
+                return
+            yield line
+
+
+app = TickbombASGI(wsgi_app)
@@ -0,0 +1,130 @@
+"""
+/calculate/batch request handling shared by the Flask view and the ASGI
+server: validation, the vectorized solve and response encoding.
+
+This module doesn't import Flask or web_app, so the ASGI server's solver
+processes can load it without building the web app's stores and caches.
+"""
+import json
+
+from metrics import ERRORS, STAGE_SECONDS, SampleBuffer
+from response_formats import FORMAT_MIMETYPES, TEXT_JSON, numeric_batch, pack_batch
+from warp_batch import MAX_BATCH_ROWS, parse_batch_row, solve_batch, tick_align_batch
+
+BATCH_FORMATS = ('text', 'numeric', 'binary')
+
+
+def batch_targets(data):
+    """
+    Target rows of a /calculate/batch request body
+
+    Returns:
+        (rows, None), or (None, message) when the batch itself is invalid
+    """
+    rows = data.get('targets') if isinstance(data, dict) else data
+    if not isinstance(rows, list):
+        return None, 'Expected an array of targets.'
+    if len(rows) > MAX_BATCH_ROWS:
+        return None, f'At most {MAX_BATCH_ROWS} targets per batch.'
+    return rows, None
+
+
+def batch_solve(rows, tick=None, stages=STAGE_SECONDS):
+    """
+    Validate and solve a batch of target rows in one vectorized pass
+
+    Args:
+        rows: Raw target rows from the request
+        tick: Optional (tick_length, tick_offset) shared by every row
+        stages: Histogram (or SampleBuffer) for the stage timings
+
+    Returns:
+        (index, columns, errors): request row of each solved row, dict of
+        per-solved-row arrays (tick fields prefixed 'tick_') and dict of
+        request row -> validation message
+    """
+    with stages.time('calculate_batch', 'parse'):
+        # Validate every row up front, keeping per-row errors in place
+        valid_index = []
+        valid_rows = []
+        row_errors = {}
+        for i, row in enumerate(rows):
+            try:
+                valid_rows.append(parse_batch_row(row))
+                valid_index.append(i)
+            except (TypeError, ValueError) as e:
+                row_errors[i] = str(e)
+
+    columns = {}
+    if valid_rows:
+        with stages.time('calculate_batch', 'solve'):
+            values = list(zip(*valid_rows))
+            columns = solve_batch(*values)
+            # Every row shares the request's tick grid
+            if tick is not None:
+                ticks = tick_align_batch(columns['total_time'], values[3], *tick)
+                columns.update(('tick_' + field, column) for field, column in ticks.items())
+    return valid_index, columns, row_errors
+
+
+def batch_results(rows, tick=None, stages=STAGE_SECONDS):
+    """
+    Solve a batch of target rows as one result dict (or {'error': message})
+    per row, in request order
+
+    Returns:
+        (results, number of invalid rows)
+    """
+    valid_index, columns, row_errors = batch_solve(rows, tick, stages)
+
+    with stages.time('calculate_batch', 'format'):
+        results = [None] * len(rows)
+        fields = [field for field in columns if not field.startswith('tick_')]
+        values = [columns[field].tolist() for field in fields]
+        for j, i in enumerate(valid_index):
+            results[i] = {field: column[j] for field, column in zip(fields, values)}
+        if tick is not None and valid_index:
+            tick_fields = [field for field in columns if field.startswith('tick_')]
+            tick_values = [columns[field].tolist() for field in tick_fields]
+            for j, i in enumerate(valid_index):
+                results[i]['tick'] = {field[5:]: column[j] for field, column in zip(tick_fields, tick_values)}
+        for i, message in row_errors.items():
+            results[i] = {'error': message}
+    return results, len(row_errors)
+
+
+def batch_body(rows, tick=None, fmt='text', stages=STAGE_SECONDS):
+    """
+    Encoded /calculate/batch response body in the negotiated format
+
+    Returns:
+        (body bytes, mimetype, number of invalid rows)
+    """
+    if fmt == 'text':
+        results, invalid = batch_results(rows, tick, stages)
+        return json.dumps({'results': results}).encode(), TEXT_JSON, invalid
+    valid_index, columns, row_errors = batch_solve(rows, tick, stages)
+    with stages.time('calculate_batch', 'format'):
+        encode = pack_batch if fmt == 'binary' else numeric_batch
+        return encode(len(rows), valid_index, columns, row_errors), FORMAT_MIMETYPES[fmt], len(row_errors)
+
+
+def pooled_batch_body(rows, tick, fmt):
+    """
+    batch_body() for a solver process: the body is encoded in the worker so
+    only bytes are pickled back, and the stage timings come back with it
+
+    Returns:
+        (body bytes, mimetype, number of invalid rows, SampleBuffer of stage timings)
+    """
+    stages = SampleBuffer()
+    body, mimetype, invalid = batch_body(rows, tick, fmt, stages)
+    return body, mimetype, invalid, stages
+
+
+def record_invalid_rows(invalid):
+    """
+    Count a batch's invalid rows in the error metrics
+    """
+    if invalid:
+        ERRORS.inc('calculate_batch', 'row_validation', amount=invalid)
@@ -0,0 +1,302 @@
+"""
+Concurrency load test of the sync (gunicorn) and async (uvicorn) servers.
+
+Each server is started on a free local port, then driven by an asyncio
+HTTP client at several concurrency levels:
+
+    python benchmarks/loadtest.py                  # both servers, JSON results
+    python benchmarks/loadtest.py --quick          # shorter runs
+    python benchmarks/loadtest.py --servers async  # one server only
+    python benchmarks/loadtest.py -o load.json
+
+Scenarios:
+    calculate_cN   N clients looping POST /calculate
+    batch_mixed    /calculate latency while other clients post large batches
+    sse_hold       /calculate at fixed concurrency while many countdown
+                   subscribers hold their connections open
+    session_poll   many paused timer sessions, each with a client long-polling
+                   for its next version; all are resumed and the time from
+                   each resume to its client waking is measured
+
+Requests that take longer than --timeout count as errors, so a server
+that stops answering shows up as a throughput collapse, not a hang.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import time
+
+from run import ROOT, metadata, percentiles, random_rows, result
+
+SERVERS = {
+    # The WSGI app alone, for comparison
+    'sync': ['gunicorn', '--bind', '127.0.0.1:{port}', '--workers', '{workers}', 'web_app:app'],
+    # Same command as the Procfile
+    'async': ['uvicorn', 'asgi_app:app', '--host', '127.0.0.1', '--port', '{port}', '--log-level', 'warning'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """
+    One server process for the duration of a with block
+    """
+
+    def __init__(self, kind, workers):
+        self.port = free_port()
+        self.command = [part.format(port=self.port, workers=workers) for part in SERVERS[kind]]
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(self.command, cwd=ROOT, stdout=subprocess.DEVNULL,
+                                        stderr=subprocess.DEVNULL, start_new_session=True)
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            try:
+                socket.create_connection(('127.0.0.1', self.port), timeout=0.5).close()
+                return self
+            except OSError:
+                time.sleep(0.1)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"{' '.join(self.command)} did not start")
+
+    def __exit__(self, exc_type, exc, tb):
+        os.killpg(self.process.pid, signal.SIGTERM)
+        try:
+            self.process.wait(10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        return False
+
+
+async def request(port, method, path, payload=None, timeout=5.0):
+    """
+    One HTTP/1.1 request on a new connection
+
+    Returns:
+        (status code, body bytes)
+    """
+    body = json.dumps(payload).encode() if payload is not None else b''
+    head = (f'{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n').encode()
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        try:
+            writer.write(head + body)
+            await writer.drain()
+            response = await reader.read()
+        finally:
+            writer.close()
+        status_line, _, rest = response.partition(b'\r\n')
+        _, _, content = rest.partition(b'\r\n\r\n')
+        return int(status_line.split()[1]), content
+
+    return await asyncio.wait_for(exchange(), timeout)
+
+
+async def subscribe(port, path, opened):
+    """
+    Hold a countdown event stream open until cancelled
+    """
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n\r\n'.encode())
+        await writer.drain()
+        opened()
+        while await reader.read(4096):
+            pass
+    finally:
+        writer.close()
+
+
+async def drive(port, concurrency, duration, make_request, timeout):
+    """
+    Run concurrency clients in a closed loop for duration seconds
+
+    Returns:
+        (latencies in ms of successful requests, error count, elapsed seconds)
+    """
+    latencies = []
+    errors = 0
+    stop_at = time.perf_counter() + duration
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < stop_at:
+            method, path, payload = make_request()
+            start = time.perf_counter()
+            try:
+                status, _ = await request(port, method, path, payload, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                status = None
+            if status == 200:
+                latencies.append((time.perf_counter() - start) * 1000)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def summarize(server, scenario, latencies, errors, elapsed, **extra):
+    prefix = f'load.{server}.{scenario}'
+    results = [
+        result(f'{prefix}.throughput', len(latencies) / elapsed, 'req/s', errors=errors, **extra),
+    ]
+    if latencies:
+        stats = percentiles(latencies)
+        results += [result(f'{prefix}.{stat}', stats[stat], 'ms') for stat in ('p50', 'p99')]
+    return results
+
+
+def calculate_request():
+    distance, warp_speed, subwarp_speed, detonation_time = random_rows(1, seed=random.random())[0]
+    return 'POST', '/calculate', {'distance': distance, 'warp_speed': warp_speed,
+                                  'subwarp_speed': subwarp_speed, 'detonation_time': detonation_time}
+
+
+async def run_server(server, port, levels, duration, subscribers, batch_rows, sessions, timeout):
+    results = []
+    # Warm up imports, caches and the solver pool
+    await drive(port, 2, min(1.0, duration), calculate_request, timeout)
+
+    for concurrency in levels:
+        latencies, errors, elapsed = await drive(port, concurrency, duration, calculate_request, timeout)
+        results += summarize(server, f'calculate_c{concurrency}', latencies, errors, elapsed,
+                             concurrency=concurrency)
+
+    batch = {'targets': [list(row) for row in random_rows(batch_rows)]}
+    batch_clients = asyncio.gather(*(drive(port, 1, duration, lambda: ('POST', '/calculate/batch', batch),
+                                           timeout * 4) for _ in range(4)))
+    latencies, errors, elapsed = await drive(port, 8, duration, calculate_request, timeout)
+    batch_runs = await batch_clients
+    results += summarize(server, 'batch_mixed', latencies, errors, elapsed, concurrency=8,
+                         batches=sum(len(run[0]) for run in batch_runs), batch_rows=batch_rows)
+
+    # Last: a sync worker stays stuck in an abandoned stream until the
+    # countdown ends. Long countdown so every subscriber stays connected
+    status, body = await request(port, 'POST', '/countdown', {'distance': 500, 'warp_speed': 0.5}, timeout)
+    if status == 200:
+        path = f"/countdown/{json.loads(body)['id']}/events"
+        opened = 0
+
+        def count():
+            nonlocal opened
+            opened += 1
+        holders = [asyncio.ensure_future(subscribe(port, path, count)) for _ in range(subscribers)]
+        await asyncio.sleep(0.5)
+        latencies, errors, elapsed = await drive(port, 8, duration, calculate_request, timeout)
+        for holder in holders:
+            holder.cancel()
+        await asyncio.gather(*holders, return_exceptions=True)
+        results += summarize(server, 'sse_hold', latencies, errors, elapsed,
+                             concurrency=8, subscribers=opened)
+
+    results += await session_poll(server, port, sessions, timeout)
+    return results
+
+
+async def session_poll(server, port, count, timeout):
+    """
+    Long-poll wake-up latency across count sessions
+    """
+    limit = asyncio.Semaphore(16)
+    wait = timeout
+
+    async def limited(method, path, payload=None):
+        async with limit:
+            try:
+                return await request(port, method, path, payload, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                return None, b''
+
+    start = time.perf_counter()
+    created = await asyncio.gather(*(limited('POST', '/sessions', {'distance': 10, 'paused': True})
+                                     for _ in range(count)))
+    create_elapsed = time.perf_counter() - start
+    created = [json.loads(body) for status, body in created if status == 200]
+
+    woken = {}
+
+    async def poll(session):
+        try:
+            status, _ = await request(port, 'GET', f"/sessions/{session['id']}?version=1&wait={wait}", None,
+                                      wait + timeout)
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+            return
+        if status == 200:
+            woken[session['id']] = time.perf_counter()
+
+    pollers = [asyncio.ensure_future(poll(session)) for session in created]
+    await asyncio.sleep(1.0)
+    resumed = {}
+
+    async def resume(session):
+        async with limit:
+            sent = time.perf_counter()
+            try:
+                status, _ = await request(port, 'POST', f"/sessions/{session['id']}/resume",
+                                          {'token': session['token']}, timeout)
+            except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+                return
+        if status == 200:
+            resumed[session['id']] = sent
+
+    await asyncio.gather(*(resume(session) for session in created))
+    await asyncio.gather(*pollers, return_exceptions=True)
+
+    latencies = [(woken[key] - resumed[key]) * 1000 for key in resumed if key in woken]
+    prefix = f'load.{server}.session_poll'
+    results = [
+        result(f'{prefix}.create_throughput', len(created) / create_elapsed, 'req/s', sessions=len(created)),
+        result(f'{prefix}.woken', len(latencies), 'clients', sessions=len(created)),
+    ]
+    if latencies:
+        stats = percentiles(latencies)
+        results += [result(f'{prefix}.wake_{stat}', stats[stat], 'ms') for stat in ('p50', 'p99')]
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', help='write results JSON to this file')
+    parser.add_argument('--quick', action='store_true', help='shorter runs, fewer levels')
+    parser.add_argument('--servers', nargs='+', choices=sorted(SERVERS), default=['sync', 'async'])
+    parser.add_argument('--workers', type=int, default=1, help='workers for the sync gunicorn server')
+    parser.add_argument('--timeout', type=float, default=5.0, help='per-request timeout in seconds')
+    args = parser.parse_args()
+
+    duration = 2.0 if args.quick else 10.0
+    levels = (1, 16, 64) if args.quick else (1, 8, 32, 128, 256)
+    subscribers = 20 if args.quick else 100
+    batch_rows = 2000 if args.quick else 10000
+    sessions = 500 if args.quick else 2000
+
+    results = []
+    for kind in args.servers:
+        with Server(kind, args.workers) as server:
+            results += asyncio.run(run_server(kind, server.port, levels, duration, subscribers,
+                                              batch_rows, sessions, args.timeout))
+
+    report = {'meta': dict(metadata(), workers=args.workers), 'results': results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,246 @@
+"""
+Benchmarks for the warp solver and the Flask endpoints.
+
+Run from the repository root:
+
+    python benchmarks/run.py                     # print results as JSON
+    python benchmarks/run.py -o results.json     # also save them
+    python benchmarks/run.py --quick             # fewer iterations
+    python benchmarks/run.py --compare old.json new.json
+
+Every result is a flat record with a name, a unit and the measured value,
+so two saved runs can be compared field by field.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+import warp_engine  # noqa: E402
+from response_formats import BINARY_BATCH, NUMERIC_JSON  # noqa: E402
+from warp_batch import solve_batch  # noqa: E402
+from warp_engine import AU_IN_M, ProfileCache, WarpProfile  # noqa: E402
+
+# Ship/target values representative of real fights
+DISTANCE_RANGE = (0.05, 50.0)  # AU
+WARP_SPEED_RANGE = (1.0, 10.0)  # AU/s
+SUBWARP_SPEED_RANGE = (50.0, 3000.0)  # m/s
+DETONATION_RANGE = (3.0, 12.0)  # s
+
+
+def random_rows(n, seed=0):
+    """
+    n random (distance, warp_speed, subwarp_speed, detonation_time) rows
+    """
+    rng = random.Random(seed)
+    return [(rng.uniform(*DISTANCE_RANGE), rng.uniform(*WARP_SPEED_RANGE),
+             rng.uniform(*SUBWARP_SPEED_RANGE), rng.uniform(*DETONATION_RANGE)) for _ in range(n)]
+
+
+def best_of(repeat, fn):
+    """
+    Fastest of several timed runs of fn(), in seconds
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def result(name, value, unit, **extra):
+    return dict(name=name, value=value, unit=unit, **extra)
+
+
+def bench_scalar(n, repeat):
+    """
+    Scalar solves per second through the legacy tuple API and WarpProfile
+    """
+    rows = random_rows(n)
+    results = []
+
+    def legacy():
+        for distance, warp_speed, subwarp_speed, detonation_time in rows:
+            (total_time, _, _, _, _, _, decel_dist, _, k_decel, max_ms) = warp_engine.calculate_time_in_warp(
+                warp_speed, subwarp_speed, distance * AU_IN_M)
+            warp_engine.calculate_distance_remaining(
+                detonation_time, k_decel, max_ms, warp_engine.warp_dropout_speed(subwarp_speed), decel_dist)
+
+    def profile():
+        for distance, warp_speed, subwarp_speed, detonation_time in rows:
+            WarpProfile(warp_speed, subwarp_speed, distance * AU_IN_M).launch(detonation_time)
+
+    for name, fn in (('scalar.legacy_tuple', legacy), ('scalar.warp_profile', profile)):
+        warp_engine.PROFILE_CACHE.clear()
+        seconds = best_of(repeat, fn)
+        results.append(result(name, n / seconds, 'solves/s', rows=n))
+    return results
+
+
+def bench_cache(n, repeat):
+    """
+    WarpProfile throughput with a cold cache, a warm cache and no cache
+    """
+    rows = random_rows(n)
+    # Few distinct ships, many distances: the common fight pattern
+    ships = [(round(w, 1), round(s)) for _, w, s, _ in random_rows(16, seed=1)]
+    fleet_rows = [(d, *ships[i % len(ships)]) for i, (d, _, _, _) in enumerate(rows)]
+    results = []
+
+    def run(cache):
+        for distance, warp_speed, subwarp_speed in fleet_rows:
+            WarpProfile(warp_speed, subwarp_speed, distance * AU_IN_M, cache=cache)
+
+    cold_timings = []
+    for _ in range(repeat):
+        cache = ProfileCache()
+        start = time.perf_counter()
+        run(cache)
+        cold_timings.append(time.perf_counter() - start)
+    results.append(result('cache.cold', n / min(cold_timings), 'solves/s', rows=n, ships=len(ships)))
+
+    cache = ProfileCache()
+    run(cache)
+    results.append(result('cache.warm', n / best_of(repeat, lambda: run(cache)), 'solves/s', rows=n, ships=len(ships)))
+    results.append(result('cache.none', n / best_of(repeat, lambda: run(None)), 'solves/s', rows=n, ships=len(ships)))
+    stats = cache.stats()
+    results.append(result('cache.warm_hit_rate', stats['hits'] / max(1, stats['hits'] + stats['misses']), 'ratio'))
+    return results
+
+
+def bench_batch(sizes, repeat):
+    """
+    Vectorized solve_batch throughput at several batch sizes
+    """
+    results = []
+    for size in sizes:
+        columns = [np.array(column) for column in zip(*random_rows(size))]
+        seconds = best_of(repeat, lambda: solve_batch(*columns))
+        results.append(result(f'batch.solve_{size}', size / seconds, 'solves/s', rows=size))
+    return results
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return {
+        'p50': ordered[len(ordered) // 2],
+        'p90': ordered[int(len(ordered) * 0.9)],
+        'p99': ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        'mean': statistics.fmean(ordered),
+    }
+
+
+def bench_requests(n, batch_size):
+    """
+    Request latency through the Flask test client and the real JSON path
+    """
+    from web_app import app, ship_catalog
+    client = app.test_client()
+    results = []
+
+    def measure(name, path, payloads, headers=None):
+        # Warm up routing, JSON and the solver caches
+        for payload in payloads[:20]:
+            client.post(path, json=payload, headers=headers)
+        samples = []
+        for payload in payloads:
+            start = time.perf_counter()
+            response = client.post(path, json=payload, headers=headers)
+            samples.append((time.perf_counter() - start) * 1e6)
+            if response.status_code != 200:
+                raise RuntimeError(f'{path} returned {response.status_code}')
+        for stat, value in percentiles(samples).items():
+            results.append(result(f'{name}.{stat}', value, 'us', requests=len(payloads)))
+
+    fields = ('distance', 'warp_speed', 'subwarp_speed', 'detonation_time')
+    rows = [dict(zip(fields, row)) for row in random_rows(n)]
+    measure('request.calculate', '/calculate', rows)
+    measure('request.calculate_numeric', '/calculate', rows, {'Accept': NUMERIC_JSON})
+    hulls = [ship['hull'] for ship in ship_catalog.search()]
+    if hulls:
+        named = [{'distance': row['distance'], 'ship': hulls[i % len(hulls)], 'detonation_time': row['detonation_time']}
+                 for i, row in enumerate(rows)]
+        measure('request.calculate_ship', '/calculate', named)
+    uncertain = [dict(row, distance={'value': row['distance'], 'sd': row['distance'] * 0.05},
+                      warp_speed={'value': row['warp_speed'], 'tolerance': 0.5}) for row in rows[:max(20, n // 10)]]
+    measure('request.uncertainty_5000', '/uncertainty', uncertain)
+
+    batches = [{'targets': [list(row) for row in random_rows(batch_size, seed=i)]} for i in range(max(5, n // 50))]
+    measure(f'request.batch_{batch_size}', '/calculate/batch', batches)
+    measure(f'request.batch_{batch_size}_numeric', '/calculate/batch', batches, {'Accept': NUMERIC_JSON})
+    measure(f'request.batch_{batch_size}_binary', '/calculate/batch', batches, {'Accept': BINARY_BATCH})
+    return results
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def run_all(quick=False):
+    repeat = 3 if quick else 5
+    n = 2000 if quick else 20000
+    results = []
+    results += bench_scalar(n, repeat)
+    results += bench_cache(n, repeat)
+    results += bench_batch((100, 10000) if quick else (100, 10000, 1000000), repeat)
+    results += bench_requests(200 if quick else 2000, 100 if quick else 1000)
+    return {'meta': metadata(), 'results': results}
+
+
+def compare(old_path, new_path):
+    """
+    Print new/old ratios for every result present in both runs
+    """
+    with open(old_path) as f:
+        old = {r['name']: r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = {r['name']: r for r in json.load(f)['results']}
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name]['value'], new[name]['value']
+        ratio = after / before if before else float('nan')
+        print(f"{name:40s} {before:14.2f} -> {after:14.2f} {new[name]['unit']:10s} x{ratio:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', help='write results JSON to this file')
+    parser.add_argument('--quick', action='store_true', help='fewer iterations')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='compare two saved runs')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run_all(quick=args.quick)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Startup time and memory of the desktop entry points.
+
+Run from the repository root:
+
+    python benchmarks/startup.py                  # print results as JSON
+    python benchmarks/startup.py -o startup.json  # also save them
+    python benchmarks/startup.py --repeat 20
+
+Every mode runs in a fresh interpreter; the result is the fastest wall
+time over the repeats and the peak RSS of that process. The window modes
+build the window, draw it once and exit, so they measure the time until
+the first frame. They need a display and are skipped without one.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name -> (arguments to python, needs a display)
+MODES = {
+    'python': (['-c', 'pass'], False),
+    'import.warp_engine': (['-c', 'import warp_engine'], False),
+    'import.tk_app': (['-c', 'import tk_app'], False),
+    'cli.no_gui': (['main.py', '--no-gui', '-d', '12.5', '-w', '5', '-s', '200'], False),
+    'cli.no_gui_ship': (['main.py', '--no-gui', '-d', '12.5', '--ship', 'Manticore'], False),
+    'window.calculator': (['-c', 'import tkinter as tk; from tk_app import TickBombingApp; '
+                           'root = tk.Tk(); TickBombingApp(root); root.update(); root.destroy()'], True),
+    'window.overlay': (['-c', 'import tkinter as tk; from tk_app import OverlayApp; '
+                        'root = tk.Tk(); OverlayApp(root, 12.5); root.update(); root.destroy()'], True),
+}
+
+
+def run_once(args):
+    """
+    Wall time in seconds and peak RSS in KiB of one interpreter run
+    """
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable] + args, cwd=ROOT, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise RuntimeError(f'{args} exited with {process.returncode}')
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    rss = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    return elapsed, rss
+
+
+def measure(repeat, names=None):
+    """
+    Results for every mode that can run here
+    """
+    has_display = sys.platform in ('win32', 'darwin') or bool(os.environ.get('DISPLAY'))
+    results = []
+    for name, (args, needs_display) in MODES.items():
+        if names and name not in names:
+            continue
+        if needs_display and not has_display:
+            print(f'{name}: skipped (no display)', file=sys.stderr)
+            continue
+        runs = [run_once(args) for _ in range(repeat)]
+        elapsed, rss = min(runs)
+        results.append({'name': f'{name}.wall', 'unit': 'ms', 'value': round(elapsed * 1e3, 2)})
+        results.append({'name': f'{name}.max_rss', 'unit': 'KiB', 'value': rss})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-o', '--output', help='also write the results to this file')
+    parser.add_argument('--repeat', type=int, default=10, help='runs per mode')
+    parser.add_argument('modes', nargs='*', metavar='MODE',
+                        help=f'modes to run (default: all): {", ".join(MODES)}')
+    args = parser.parse_args()
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f'unknown modes: {", ".join(sorted(unknown))}')
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': measure(args.repeat, args.modes),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
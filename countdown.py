@@ -0,0 +1,187 @@
+import asyncio
+import json
+import time
+import uuid
+from threading import Event, Lock
+
+# Countdowns are dropped this many seconds after the target lands
+COUNTDOWN_EXPIRY = 300
+# Idle SSE connections get a comment line this often to keep proxies open
+KEEPALIVE_INTERVAL = 15
+
+
+class Countdown:
+    """
+    One shared countdown on the server clock.
+
+    The event schedule is computed once when the countdown is created and
+    every subscriber streams from the same list.
+
+    Args:
+        profile: WarpProfile of the target
+        launch_time: Launch time in seconds after warp start
+        align_alert: Seconds before launch to raise the align alert
+        bomb_alert: Seconds before launch to raise the bomb alert
+        started_at: Server time (time.time()) of warp start
+    """
+    __slots__ = ('id', 'started_at', 'launch_time', 'total_time', 'events', 'stopped', '_wakers', '_wakers_lock')
+
+    def __init__(self, profile, launch_time, align_alert, bomb_alert, started_at=None):
+        self.id = uuid.uuid4().hex[:12]
+        self.started_at = time.time() if started_at is None else started_at
+        self.launch_time = launch_time
+        self.total_time = profile.total_time
+        self.stopped = Event()
+        # (loop, asyncio.Event) pairs of async subscribers to wake on stop
+        self._wakers = set()
+        self._wakers_lock = Lock()
+
+        # Same alerts and messages as the browser and Tk countdowns
+        events = [
+            (0.0, 'phase', {'phase': 'accel'}),
+            (profile.cruise_end, 'phase', {'phase': 'decel'}),
+            (profile.total_time, 'phase', {'phase': 'landed'}),
+            (launch_time - align_alert, 'alert', {'alert': 'ALIGN', 'message': 'ALIGN NOW!'}),
+            (launch_time - bomb_alert, 'alert', {'alert': 'LAUNCH', 'message': 'LAUNCH BOMB!'}),
+            (launch_time, 'alert', {'alert': 'LANDING', 'message': 'TARGET LANDING!'}),
+        ]
+        if profile.cruise_time > 0:
+            events.append((profile.accel_time, 'phase', {'phase': 'cruise'}))
+        events.sort(key=lambda event: event[0])
+        self.events = [(self.started_at + max(offset, 0.0), name, dict(payload, offset=offset))
+                       for offset, name, payload in events]
+
+    @property
+    def ends_at(self):
+        return self.events[-1][0]
+
+    def describe(self):
+        """
+        JSON-friendly summary used by the create and sync responses
+        """
+        return {
+            'id': self.id,
+            'started_at': self.started_at,
+            'server_time': time.time(),
+            'launch_time': self.launch_time,
+            'total_time': self.total_time,
+            'events': [dict(payload, event=name, at=at) for at, name, payload in self.events],
+        }
+
+    def stream(self):
+        """
+        Server-Sent Events for this countdown, from now until the last event
+
+        Yields:
+            SSE-formatted strings
+        """
+        yield format_sse('sync', self.describe())
+
+        # Skip events that already fired before this subscriber joined
+        now = time.time()
+        pending = [event for event in self.events if event[0] > now]
+
+        for at, name, payload in pending:
+            # Sleep until the deadline, waking early only for keepalives or a stop
+            while True:
+                delay = at - time.time()
+                if delay <= 0:
+                    break
+                if self.stopped.wait(min(delay, KEEPALIVE_INTERVAL)):
+                    yield format_sse('stopped', {'id': self.id})
+                    return
+                if at - time.time() > 0:
+                    yield ': keepalive\n\n'
+            yield format_sse(name, dict(payload, at=at, server_time=time.time()))
+
+        yield format_sse('end', {'id': self.id})
+
+    async def astream(self):
+        """
+        Async version of stream() for the ASGI server; waits on the event
+        loop instead of holding a thread per subscriber
+
+        Yields:
+            SSE-formatted strings
+        """
+        waker = (asyncio.get_running_loop(), asyncio.Event())
+        with self._wakers_lock:
+            self._wakers.add(waker)
+        try:
+            yield format_sse('sync', self.describe())
+
+            now = time.time()
+            pending = [event for event in self.events if event[0] > now]
+
+            for at, name, payload in pending:
+                while True:
+                    delay = at - time.time()
+                    if delay <= 0:
+                        break
+                    if self.stopped.is_set():
+                        yield format_sse('stopped', {'id': self.id})
+                        return
+                    try:
+                        await asyncio.wait_for(waker[1].wait(), min(delay, KEEPALIVE_INTERVAL))
+                    except asyncio.TimeoutError:
+                        if at - time.time() > 0:
+                            yield ': keepalive\n\n'
+                yield format_sse(name, dict(payload, at=at, server_time=time.time()))
+
+            yield format_sse('end', {'id': self.id})
+        finally:
+            with self._wakers_lock:
+                self._wakers.discard(waker)
+
+    def stop(self):
+        """
+        Stop the countdown and wake every subscriber
+        """
+        self.stopped.set()
+        with self._wakers_lock:
+            wakers = list(self._wakers)
+        for loop, event in wakers:
+            loop.call_soon_threadsafe(event.set)
+
+
+class CountdownRegistry:
+    """
+    In-memory store of shared countdowns with expiry of finished ones
+    """
+
+    def __init__(self, expiry=COUNTDOWN_EXPIRY):
+        self.expiry = expiry
+        self._countdowns = {}
+        self._lock = Lock()
+
+    def add(self, countdown):
+        with self._lock:
+            self._prune(time.time())
+            self._countdowns[countdown.id] = countdown
+        return countdown
+
+    def get(self, countdown_id):
+        with self._lock:
+            return self._countdowns.get(countdown_id)
+
+    def stop(self, countdown_id):
+        """
+        Stop a countdown and close its subscribers' streams
+        """
+        with self._lock:
+            countdown = self._countdowns.pop(countdown_id, None)
+        if countdown is not None:
+            countdown.stop()
+        return countdown
+
+    def _prune(self, now):
+        expired = [key for key, countdown in self._countdowns.items() if countdown.ends_at + self.expiry < now]
+        for key in expired:
+            del self._countdowns[key]
+
+
+def format_sse(event, data):
+    """
+    Format one Server-Sent Event
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,79 @@
+import numpy as np
+
+from warp_batch import calculate_time_in_warp_batch, tick_align_batch
+from warp_engine import AU_IN_M
+
+# Seconds a bomber needs between two launches
+DEFAULT_RELOAD_TIME = 10.0
+# Upper bound on target/bomber pairs in one plan
+MAX_PLAN_PAIRS = 100000
+
+
+def plan_fleet(distance_au, warp_speed, subwarp_speed, detonation_time, pair_target, pair_bomber,
+               reload_time=DEFAULT_RELOAD_TIME, min_launch_time=0.0, tick=None):
+    """
+    Launch schedule for several bombers against several warping targets.
+
+    Each target's warp is solved once; every (target, bomber) pair then
+    launches so its bomb detonates as that target lands.
+
+    Args:
+        distance_au: Array of target warp distances in AU
+        warp_speed: Array of target warp speeds in AU/s
+        subwarp_speed: Array of target sub-warp speeds in m/s
+        detonation_time: Array of bomber detonation times in seconds
+        pair_target: Target index of each pair
+        pair_bomber: Bomber index of each pair
+        reload_time: Seconds a bomber needs between launches
+        min_launch_time: Earliest usable launch, in seconds after warp start
+        tick: Optional (tick_length, tick_offset) to snap launches to
+
+    Returns:
+        Dict of per-pair arrays sorted by launch time: target, bomber,
+        launch_time, landing_time, out_of_range and bomb_overlap flags
+    """
+    pair_target = np.asarray(pair_target, dtype=np.int64)
+    pair_bomber = np.asarray(pair_bomber, dtype=np.int64)
+    distance_au = np.asarray(distance_au, dtype=np.float64)
+    warp_speed = np.asarray(warp_speed, dtype=np.float64)
+    subwarp_speed = np.asarray(subwarp_speed, dtype=np.float64)
+    detonation_time = np.asarray(detonation_time, dtype=np.float64)
+
+    # One solve per target, then broadcast to its pairs
+    total_time = calculate_time_in_warp_batch(warp_speed, subwarp_speed, distance_au * AU_IN_M)['total_time']
+    pair_total = total_time[pair_target]
+    pair_detonation = detonation_time[pair_bomber]
+
+    if tick is None:
+        launch_time = pair_total - pair_detonation
+        landing_time = pair_total
+        earliest = min_launch_time
+    else:
+        ticks = tick_align_batch(pair_total, pair_detonation, *tick)
+        launch_time = ticks['launch_time']
+        landing_time = ticks['landing_time']
+        earliest = ticks['warp_start_time'] + min_launch_time
+
+    # A bomb with a longer fuse than the warp would have to launch too early
+    out_of_range = launch_time < earliest
+
+    # Time-sorted schedule
+    order = np.argsort(launch_time, kind='stable')
+
+    # Group by bomber (then launch time) to find launches inside the reload time
+    by_bomber = np.lexsort((launch_time, pair_bomber))
+    same_bomber = pair_bomber[by_bomber][1:] == pair_bomber[by_bomber][:-1]
+    too_close = same_bomber & (np.diff(launch_time[by_bomber]) < reload_time)
+    bomb_overlap = np.zeros(len(pair_target), dtype=bool)
+    bomb_overlap[by_bomber[1:][too_close]] = True
+    bomb_overlap[by_bomber[:-1][too_close]] = True
+
+    return {
+        'target': pair_target[order],
+        'bomber': pair_bomber[order],
+        'launch_time': launch_time[order],
+        'landing_time': landing_time[order],
+        'detonation_time': pair_detonation[order],
+        'out_of_range': out_of_range[order],
+        'bomb_overlap': bomb_overlap[order],
+    }
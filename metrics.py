@@ -0,0 +1,182 @@
+"""
+In-process request metrics rendered in the Prometheus text format.
+
+Counters and histograms are plain dicts keyed on label tuples and guarded
+by one lock each, so recording a sample costs a dict lookup and a bisect.
+"""
+import bisect
+import time
+from threading import Lock
+
+# Latency buckets in seconds, from tens of microseconds (solver stages) to
+# seconds (large batches)
+DEFAULT_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+                   0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Counter:
+    """
+    Monotonic counter with labels
+    """
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram with labels
+    """
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), then sum
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labels):
+        """
+        Context manager that observes the elapsed time of its block
+        """
+        return Timer(self, labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted((labels, list(series)) for labels, series in self._series.items())
+        bucket_names = self.labelnames + ('le',)
+        for labels, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_format_labels(bucket_names, labels + (bound,))} {cumulative}')
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f'{self.name}_sum{label_text} {series[-1]}')
+            lines.append(f'{self.name}_count{label_text} {cumulative}')
+        return lines
+
+
+class Gauge:
+    """
+    Gauge whose values are read from a callback at scrape time
+
+    Args:
+        collect: Callable returning {label tuple: value}
+    """
+
+    def __init__(self, name, help_text, labelnames, collect):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self.collect = collect
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} gauge']
+        for labels, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, labels)} {value}')
+        return lines
+
+
+class SampleBuffer:
+    """
+    Stand-in for a Histogram that keeps its samples instead, so work timed
+    in another process can be recorded by the parent with replay()
+    """
+
+    def __init__(self):
+        self.samples = []
+
+    def observe(self, value, *labels):
+        self.samples.append((value, labels))
+
+    def time(self, *labels):
+        return Timer(self, labels)
+
+    def replay(self, histogram):
+        for value, labels in self.samples:
+            histogram.observe(value, *labels)
+
+
+class Timer:
+    __slots__ = ('histogram', 'labels', 'start')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Registry:
+    """
+    Collection of metrics rendered together on /metrics
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        text = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{text}"')
+    return '{' + ','.join(pairs) + '}'
+
+
+# Instruments used by the web app
+REGISTRY = Registry()
+REQUESTS = REGISTRY.register(Counter(
+    'tickbomb_requests_total', 'HTTP requests by endpoint and status code', ('endpoint', 'status')))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'tickbomb_request_seconds', 'Request handling time by endpoint', ('endpoint',)))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    'tickbomb_stage_seconds', 'Time spent in each request stage (parse, solve, format)', ('endpoint', 'stage')))
+ERRORS = REGISTRY.register(Counter(
+    'tickbomb_errors_total', 'Error responses by endpoint and kind', ('endpoint', 'kind')))
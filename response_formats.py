@@ -0,0 +1,207 @@
+"""
+Machine-readable response encodings, chosen by the Accept header.
+
+    application/json                 Display strings for the browser (default)
+    application/vnd.tickbomb+json    Plain numbers in SI units, no formatting
+    application/vnd.tickbomb.batch   Packed binary columns (/calculate/batch only)
+
+A 'format' query parameter ('text', 'numeric' or 'binary') overrides the
+Accept header for clients that can't set it.
+
+Binary batch layout (all little-endian):
+
+    header   '<4sHHII'  magic b'TBKB', version, field count, row count,
+                        solved row count
+    fields   per field: name length (B), ASCII name, type code (1 char:
+                        'd' float64, 'q' int64)
+    padding  zero bytes up to a multiple of 8
+    columns  per field: solved-row-count values of its type, in field order
+    errors   u32 length, then a UTF-8 JSON array of [row, message]
+
+The 'index' column holds the request row of each solved row; rows that
+failed validation are only listed in the errors trailer.
+"""
+import json
+import struct
+
+import numpy as np
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+
+from warp_engine import AU_IN_M
+
+TEXT_JSON = 'application/json'
+NUMERIC_JSON = 'application/vnd.tickbomb+json'
+BINARY_BATCH = 'application/vnd.tickbomb.batch'
+
+FORMAT_MIMETYPES = {'text': TEXT_JSON, 'numeric': NUMERIC_JSON, 'binary': BINARY_BATCH}
+MIMETYPE_FORMATS = {mimetype: name for name, mimetype in FORMAT_MIMETYPES.items()}
+
+BINARY_MAGIC = b'TBKB'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHHII')
+BINARY_TYPES = {'d': np.dtype('<f8'), 'q': np.dtype('<i8')}
+
+
+def negotiate(accept, format_param=None, offers=('text', 'numeric')):
+    """
+    Pick a response format for a request
+
+    Args:
+        accept: Accept header value (may be None)
+        format_param: Value of the 'format' query parameter, if any
+        offers: Formats the endpoint can produce, preferred first
+
+    Returns:
+        A format name from offers
+
+    Raises:
+        ValueError: If format_param names a format that isn't offered
+    """
+    if format_param:
+        if format_param not in offers:
+            raise ValueError(f"Unsupported format '{format_param}'. Use one of: {', '.join(offers)}.")
+        return format_param
+    if not accept:
+        return offers[0]
+    # Offers are listed preferred-first, so '*/*' keeps the text default
+    match = parse_accept_header(accept, MIMEAccept).best_match([FORMAT_MIMETYPES[name] for name in offers])
+    return MIMETYPE_FORMATS[match] if match else offers[0]
+
+
+def text_calculation(distance_au, warp_speed, subwarp_speed, detonation_time, profile, timing):
+    """
+    /calculate result as display strings for the browser
+
+    static/js/warp_engine.js builds the same strings for in-page solves;
+    keep the two in step.
+    """
+    distance_m = profile.warp_dist
+    remaining = timing.distance_remaining
+    current_speed = timing.current_speed
+    return {
+        'target_info': {
+            'warp_distance': f"{distance_au:.2f} AU ({distance_m/1000:,.0f} km)",
+            'warp_speed': f"{warp_speed} AU/s",
+            'subwarp_speed': f"{subwarp_speed} m/s",
+            'detonation_time': f"{detonation_time} seconds"
+        },
+        'warp_time': {
+            'accel_phase': f"{profile.accel_time:.2f} seconds (distance: {profile.accel_dist/1000:,.0f} km)",
+            'cruise_phase': f"{profile.cruise_time:.2f} seconds (distance: {profile.cruise_dist/1000:,.0f} km)",
+            'decel_phase': f"{profile.decel_time:.2f} seconds (distance: {profile.decel_dist/1000:,.0f} km)",
+            'total_time': f"{profile.total_time:.2f} seconds"
+        },
+        'bomb_timing': {
+            'launch_time': f"{timing.launch_time:.2f} seconds after warp start",
+            'time_before_landing': f"{detonation_time:.2f} seconds before landing",
+            'distance_remaining': f"{remaining / AU_IN_M:.4f} AU ({remaining/1000:,.0f} km)",
+            'current_speed': f"{current_speed:,.0f} m/s ({current_speed/AU_IN_M:.2f} AU/s)"
+        },
+        'countdown': {
+            'total_time': profile.total_time,
+            'launch_time': timing.launch_time
+        }
+    }
+
+
+def numeric_calculation(distance_au, warp_speed, subwarp_speed, detonation_time, profile, timing,
+                        tick_timing=None):
+    """
+    /calculate result as plain numbers: distances in meters, speeds in m/s
+    and times in seconds after warp start
+    """
+    result = {
+        'distance': profile.warp_dist,
+        'warp_speed': warp_speed,
+        'subwarp_speed': subwarp_speed,
+        'detonation_time': detonation_time,
+        'total_time': profile.total_time,
+        'peak_speed': profile.peak_speed,
+        'accel_time': profile.accel_time,
+        'accel_dist': profile.accel_dist,
+        'cruise_time': profile.cruise_time,
+        'cruise_dist': profile.cruise_dist,
+        'decel_time': profile.decel_time,
+        'decel_dist': profile.decel_dist,
+        'launch_time': timing.launch_time,
+        'distance_remaining': timing.distance_remaining,
+        'current_speed': timing.current_speed,
+    }
+    if tick_timing is not None:
+        result['tick'] = tick_timing.as_dict()
+    return result
+
+
+def numeric_batch(rows, index, columns, errors):
+    """
+    Columnar numeric JSON for a solved batch
+
+    Args:
+        rows: Number of rows in the request
+        index: Request row of each solved row
+        columns: Dict of per-solved-row arrays
+        errors: Dict of request row -> validation message
+    """
+    return json.dumps({
+        'rows': rows,
+        'index': np.asarray(index, dtype=np.int64).tolist(),
+        'columns': {field: column.tolist() for field, column in columns.items()},
+        'errors': [[row, message] for row, message in sorted(errors.items())],
+    }, separators=(',', ':')).encode()
+
+
+def pack_batch(rows, index, columns, errors):
+    """
+    Binary batch encoding (see the module docstring); same arguments as
+    numeric_batch
+    """
+    columns = dict(index=np.asarray(index, dtype=np.int64), **columns)
+    solved = len(columns['index'])
+
+    parts = [BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(columns), rows, solved)]
+    arrays = []
+    for field, column in columns.items():
+        code = 'q' if np.issubdtype(column.dtype, np.integer) else 'd'
+        name = field.encode('ascii')
+        parts.append(struct.pack('<B', len(name)) + name + code.encode('ascii'))
+        arrays.append(np.ascontiguousarray(column, dtype=BINARY_TYPES[code]))
+    size = sum(len(part) for part in parts)
+    parts.append(b'\0' * (-size % 8))
+    parts.extend(array.tobytes() for array in arrays)
+
+    trailer = json.dumps([[row, message] for row, message in sorted(errors.items())]).encode()
+    parts.append(struct.pack('<I', len(trailer)) + trailer)
+    return b''.join(parts)
+
+
+def unpack_batch(buffer):
+    """
+    Decode a binary batch response
+
+    Returns:
+        (rows, columns dict of numpy arrays including 'index', errors dict)
+    """
+    buffer = memoryview(buffer)
+    magic, version, field_count, rows, solved = BINARY_HEADER.unpack_from(buffer)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError('Not a tickbomb binary batch.')
+
+    offset = BINARY_HEADER.size
+    fields = []
+    for _ in range(field_count):
+        length = buffer[offset]
+        name = bytes(buffer[offset + 1:offset + 1 + length]).decode('ascii')
+        code = chr(buffer[offset + 1 + length])
+        fields.append((name, BINARY_TYPES[code]))
+        offset += length + 2
+    offset += -offset % 8
+
+    columns = {}
+    for name, dtype in fields:
+        columns[name] = np.frombuffer(buffer, dtype=dtype, count=solved, offset=offset)
+        offset += solved * dtype.itemsize
+
+    (length,) = struct.unpack_from('<I', buffer, offset)
+    errors = {row: message for row, message in json.loads(bytes(buffer[offset + 4:offset + 4 + length]))}
+    return rows, columns, errors
@@ -0,0 +1,84 @@
+import heapq
+import itertools
+import time
+
+# Deadlines this close to now are treated as due, in seconds
+FIRE_TOLERANCE = 0.001
+
+
+class DeadlineScheduler:
+    """
+    Run callbacks at absolute clock deadlines on a single timer.
+
+    Only the earliest pending deadline is armed with the event loop's
+    after(); each wakeup recomputes the delay from the clock, so callbacks
+    fire at their computed instants instead of at a polling interval, and
+    lateness from one wakeup doesn't accumulate into the next.
+
+    Args:
+        after: Tk-style after(ms, callback) returning a timer id
+        after_cancel: Tk-style after_cancel(timer_id)
+        clock: Monotonic clock in seconds
+    """
+
+    def __init__(self, after, after_cancel, clock=time.perf_counter):
+        self.after = after
+        self.after_cancel = after_cancel
+        self.clock = clock
+        self._queue = []
+        self._counter = itertools.count()
+        self._timer = None
+        self._armed_for = None
+        self._firing = False
+
+    def schedule(self, deadline, callback, *args):
+        """
+        Call callback(*args, lateness) once clock() reaches deadline
+
+        lateness is how many seconds after the deadline the callback ran,
+        so it can compensate (e.g. when computing the next deadline).
+        """
+        heapq.heappush(self._queue, (deadline, next(self._counter), callback, args))
+        if not self._firing and (self._armed_for is None or deadline < self._armed_for):
+            self._arm()
+
+    def cancel_all(self):
+        """
+        Drop every pending callback
+        """
+        self._queue.clear()
+        self._disarm()
+
+    def pending(self):
+        return len(self._queue)
+
+    def _disarm(self):
+        if self._timer is not None:
+            self.after_cancel(self._timer)
+        self._timer = None
+        self._armed_for = None
+
+    def _arm(self):
+        self._disarm()
+        if not self._queue:
+            return
+        deadline = self._queue[0][0]
+        delay_ms = max(0, int((deadline - self.clock()) * 1000))
+        self._armed_for = deadline
+        self._timer = self.after(delay_ms, self._fire)
+
+    def _fire(self):
+        self._timer = None
+        self._armed_for = None
+        self._firing = True
+        try:
+            while self._queue:
+                now = self.clock()
+                deadline, _, callback, args = self._queue[0]
+                if deadline > now + FIRE_TOLERANCE:
+                    break
+                heapq.heappop(self._queue)
+                callback(*args, max(0.0, now - deadline))
+        finally:
+            self._firing = False
+        self._arm()
@@ -0,0 +1,174 @@
+"""
+Ship-class catalog: hull names mapped to warp and sub-warp speeds.
+
+The catalog (data/ships.json by default, or TICKBOMB_SHIP_CATALOG) lists
+each hull's base warp speed (AU/s) and sub-warp speed (m/s), plus typical
+fits as speed multipliers:
+
+    {"fits": {"Hyperspatial T2 x2": {"warp_speed": 1.5625}},
+     "ships": [{"hull": "Rifter", "group": "Frigate",
+                "warp_speed": 5.0, "subwarp_speed": 355}]}
+
+Fits apply to every hull unless a ship lists the fit names it takes in
+its own "fits". Every hull and fit is indexed by normalized name and its
+acceleration/deceleration phases are computed once at load time into a
+dedicated ProfileCache, so solving for a named ship never recomputes them.
+"""
+import bisect
+import difflib
+import json
+import math
+import os
+
+from warp_engine import ProfileCache, WarpProfile
+
+DEFAULT_CATALOG_PATH = os.environ.get(
+    'TICKBOMB_SHIP_CATALOG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ships.json'))
+# Close matches suggested for an unknown hull name
+MAX_SUGGESTIONS = 3
+
+
+def normalize_name(name):
+    """
+    Case- and whitespace-insensitive lookup key for a hull or fit name
+    """
+    return ' '.join(str(name).split()).casefold()
+
+
+class ShipClass:
+    """
+    One hull with one fit (or none), and its precomputed warp phases
+    """
+    __slots__ = ('hull', 'group', 'fit', 'warp_speed', 'subwarp_speed', 'phases')
+
+    def __init__(self, hull, group, fit, warp_speed, subwarp_speed, phases):
+        self.hull = hull
+        self.group = group
+        self.fit = fit
+        self.warp_speed = warp_speed
+        self.subwarp_speed = subwarp_speed
+        self.phases = phases
+
+    def as_dict(self):
+        return {
+            'fit': self.fit,
+            'warp_speed': self.warp_speed,
+            'subwarp_speed': self.subwarp_speed,
+            'accel_time': self.phases.accel_time,
+            'accel_dist': self.phases.accel_dist,
+            'decel_time': self.phases.decel_time,
+            'decel_dist': self.phases.decel_dist,
+        }
+
+
+class ShipCatalog:
+    """
+    Indexed, pre-warmed ship-class catalog
+
+    Args:
+        ships: List of ship dicts with hull, group, warp_speed, subwarp_speed
+            and optional fits (see the module docstring)
+        fits: Dict of fit name -> {'warp_speed': x, 'subwarp_speed': y}
+            multipliers
+    """
+
+    def __init__(self, ships=(), fits=None):
+        fits = fits or {}
+        # normalized hull -> {normalized fit or None: ShipClass}
+        self._hulls = {}
+
+        variants = []
+        for ship in ships:
+            hull = str(ship['hull'])
+            key = normalize_name(hull)
+            if key in self._hulls:
+                raise ValueError(f"Duplicate hull '{hull}' in the ship catalog.")
+            warp_speed = float(ship['warp_speed'])
+            subwarp_speed = float(ship['subwarp_speed'])
+            if not (math.isfinite(warp_speed) and warp_speed > 0 and math.isfinite(subwarp_speed) and subwarp_speed > 0):
+                raise ValueError(f"Hull '{hull}' needs warp and sub-warp speeds greater than zero.")
+
+            variants.append((hull, ship.get('group', ''), None, warp_speed, subwarp_speed))
+            for fit in ship.get('fits', list(fits)):
+                if fit not in fits:
+                    raise ValueError(f"Hull '{hull}' lists unknown fit '{fit}'.")
+                variants.append((hull, ship.get('group', ''), fit,
+                                 warp_speed * float(fits[fit].get('warp_speed', 1)),
+                                 subwarp_speed * float(fits[fit].get('subwarp_speed', 1))))
+            self._hulls[key] = {}
+
+        # Sized to hold every variant, so lookups never evict
+        self.cache = ProfileCache(maxsize=max(1, len(variants)))
+        for hull, group, fit, warp_speed, subwarp_speed in variants:
+            ship = ShipClass(hull, group, fit, warp_speed, subwarp_speed, self.cache.get(warp_speed, subwarp_speed))
+            self._hulls[normalize_name(hull)][None if fit is None else normalize_name(fit)] = ship
+
+        # Sorted normalized names for prefix search
+        self._sorted_keys = sorted(self._hulls)
+
+    def __len__(self):
+        return len(self._hulls)
+
+    def resolve(self, hull, fit=None):
+        """
+        ShipClass for a hull name and optional fit name
+
+        Raises:
+            ValueError: For an unknown hull, or a fit the hull doesn't take
+        """
+        variants = self._hulls.get(normalize_name(hull))
+        if variants is None:
+            suggestions = difflib.get_close_matches(normalize_name(hull), self._sorted_keys, n=MAX_SUGGESTIONS)
+            message = f"Unknown ship '{hull}'."
+            if suggestions:
+                names = ', '.join(self._hulls[key][None].hull for key in suggestions)
+                message += f' Did you mean: {names}?'
+            raise ValueError(message)
+        ship = variants.get(None if fit is None or fit == '' else normalize_name(fit))
+        if ship is None:
+            fits = ', '.join(variant.fit for variant in variants.values() if variant.fit is not None)
+            raise ValueError(f"Unknown fit '{fit}' for {variants[None].hull}." + (f' Fits: {fits}.' if fits else ''))
+        return ship
+
+    def profile(self, hull, fit, warp_dist):
+        """
+        WarpProfile for a named ship, from the precomputed phases
+        """
+        ship = self.resolve(hull, fit)
+        return WarpProfile(ship.warp_speed, ship.subwarp_speed, warp_dist, cache=self.cache)
+
+    def search(self, prefix='', group=None):
+        """
+        Hulls whose name starts with prefix (all hulls for ''), optionally
+        limited to one group, in name order
+
+        Returns:
+            List of dicts with hull, group and one entry per fit (the first,
+            with fit None, is the bare hull)
+        """
+        key = normalize_name(prefix)
+        start = bisect.bisect_left(self._sorted_keys, key)
+        stop = bisect.bisect_left(self._sorted_keys, key + '\U0010ffff') if key else len(self._sorted_keys)
+        results = []
+        for name in self._sorted_keys[start:stop]:
+            variants = self._hulls[name]
+            base = variants[None]
+            if group is not None and normalize_name(base.group) != normalize_name(group):
+                continue
+            results.append({'hull': base.hull, 'group': base.group,
+                            'fits': [variant.as_dict() for variant in variants.values()]})
+        return results
+
+
+def load_catalog(path=DEFAULT_CATALOG_PATH):
+    """
+    Load a ship catalog file
+
+    Returns:
+        ShipCatalog, empty when the file doesn't exist
+    """
+    if not path or not os.path.exists(path):
+        return ShipCatalog()
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return ShipCatalog(data.get('ships', []), data.get('fits', {}))
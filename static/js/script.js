@@ -3,16 +3,21 @@ document.addEventListener('DOMContentLoaded', function() {
     const calculateBtn = document.getElementById('calculate-btn');
     const startBtn = document.getElementById('start-btn');
     const stopBtn = document.getElementById('stop-btn');
+    const pauseBtn = document.getElementById('pause-btn');
     const distanceInput = document.getElementById('distance');
+    const shipInput = document.getElementById('ship');
+    const shipList = document.getElementById('ship-list');
     const warpSpeedInput = document.getElementById('warp-speed');
     const subwarpSpeedInput = document.getElementById('subwarp-speed');
     const detonationTimeInput = document.getElementById('detonation-time');
     const alignAlertInput = document.getElementById('align-alert');
     const bombAlertInput = document.getElementById('bomb-alert');
+    const shareTimerInput = document.getElementById('share-timer');
     const timerElement = document.getElementById('timer');
     const statusElement = document.getElementById('status');
     const progressBar = document.getElementById('progress-bar');
     const resultsElement = document.getElementById('results');
+    const shareElement = document.getElementById('share-link');
     
     // Audio context for sound alerts
     let audioContext;
@@ -32,10 +37,59 @@ document.addEventListener('DOMContentLoaded', function() {
     let alignAlertTriggered = false;
     let bombAlertTriggered = false;
     
+    // Shared countdown streamed from the server (older share links)
+    let eventSource;
+    let serverAlerts = false;
+    
+    // Shared timer session: followed on the local clock plus the server
+    // clock offset; the token is only known to the session's creator
+    let session = null;
+    let sessionToken = null;
+    
     // Event listeners
     calculateBtn.addEventListener('click', calculate);
     startBtn.addEventListener('click', startCountdown);
     stopBtn.addEventListener('click', stopCountdown);
+    pauseBtn.addEventListener('click', togglePause);
+    
+    // Ship catalog: picking a hull (or hull and fit) fills in its speeds
+    const shipSpeeds = {};
+    shipInput.addEventListener('change', applyShip);
+    loadShips();
+    
+    // Join a shared timer when opened from a share link
+    const params = new URLSearchParams(window.location.search);
+    if (params.get('session')) {
+        joinSession(params.get('session'));
+    } else if (params.get('countdown')) {
+        joinCountdown(params.get('countdown'));
+    }
+    
+    function loadShips() {
+        fetch('/ships')
+            .then(response => response.json())
+            .then(data => {
+                data.ships.forEach(ship => {
+                    ship.fits.forEach(fit => {
+                        const name = fit.fit ? `${ship.hull} (${fit.fit})` : ship.hull;
+                        shipSpeeds[name.toLowerCase()] = fit;
+                        const option = document.createElement('option');
+                        option.value = name;
+                        option.label = ship.group;
+                        shipList.appendChild(option);
+                    });
+                });
+            })
+            .catch(error => console.warn('Ship catalog unavailable:', error));
+    }
+    
+    function applyShip() {
+        const ship = shipSpeeds[shipInput.value.trim().toLowerCase()];
+        if (ship) {
+            warpSpeedInput.value = ship.warp_speed;
+            subwarpSpeedInput.value = ship.subwarp_speed;
+        }
+    }
     
     // Calculate function
     function calculate() {
@@ -53,38 +107,21 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
         
-        // Send request to backend
-        fetch('/calculate', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json'
-            },
-            body: JSON.stringify(inputData)
-        })
-        .then(response => response.json())
-        .then(data => {
-            if (data.error) {
-                displayError(data.error);
-                return;
-            }
-            
-            displayResults(data);
-            
-            // Store values for countdown
-            totalTime = data.countdown.total_time;
-            launchTime = data.countdown.launch_time;
-            
-            // Enable timer controls
-            startBtn.disabled = false;
-            stopBtn.disabled = true;
-            
-            // Reset progress bar
-            progressBar.style.width = '0%';
-        })
-        .catch(error => {
-            console.error('Error:', error);
-            displayError('An error occurred while calculating');
-        });
+        // Solve in the page; the server is only needed for shared countdowns
+        const data = WarpEngine.calculate(inputData.distance, inputData.warp_speed,
+                                          inputData.subwarp_speed, inputData.detonation_time);
+        displayResults(data);
+        
+        // Store values for countdown
+        totalTime = data.countdown.total_time;
+        launchTime = data.countdown.launch_time;
+        
+        // Enable timer controls
+        startBtn.disabled = false;
+        stopBtn.disabled = true;
+        
+        // Reset progress bar
+        progressBar.style.width = '0%';
     }
     
     // Display the calculation results
@@ -180,11 +217,196 @@ document.addEventListener('DOMContentLoaded', function() {
         playSound('start');
         
         countdownInterval = setInterval(updateCountdown, 50);
+        
+        // Only a shared timer creates a session and keeps a long-poll open
+        if (shareTimerInput.checked) {
+            shareSession();
+        }
+    }
+    
+    // Publish the timer as a session so other clients can join it
+    function shareSession() {
+        fetch('/sessions', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                distance: parseFloat(distanceInput.value),
+                warp_speed: parseFloat(warpSpeedInput.value),
+                subwarp_speed: parseFloat(subwarpSpeedInput.value),
+                detonation_time: parseFloat(detonationTimeInput.value),
+                align_alert: alignAlertTime,
+                bomb_alert: bombAlertTime
+            })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.error || !countdownInterval) {
+                return;
+            }
+            sessionToken = data.token;
+            pauseBtn.disabled = false;
+            return followSession(data);
+        })
+        .catch(error => console.warn('Shared timer unavailable:', error));
+    }
+    
+    // Join a timer session someone else started
+    function joinSession(id) {
+        fetch(`/sessions/${id}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                displayError(data.error);
+                return;
+            }
+            totalTime = data.total_time;
+            launchTime = data.launch_time;
+            alignAlertTime = data.align_alert;
+            bombAlertTime = data.bomb_alert;
+            alignAlertTriggered = false;
+            bombAlertTriggered = false;
+            
+            startBtn.disabled = true;
+            stopBtn.disabled = false;
+            timerElement.style.color = 'var(--accent-color)';
+            
+            // Until the clock offset is measured, assume no offset
+            startTime = Date.now() - data.elapsed * 1000;
+            countdownInterval = setInterval(updateCountdown, 50);
+            return followSession(data);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            displayError('Could not join the shared timer');
+        });
+    }
+    
+    // Render from the session snapshot on the server clock from now on
+    async function followSession(data) {
+        const clock = await TimerSync.estimateOffset();
+        if (!countdownInterval) {
+            return;
+        }
+        session = new TimerSync.SessionFollower(data, clock.offset, snapshot => {
+            if (snapshot === null || snapshot.state === 'stopped') {
+                sessionToken = null;
+                stopCountdown();
+            } else {
+                showSessionState(snapshot);
+            }
+        });
+        showSessionState(data);
+        
+        const shareUrl = `${window.location.origin}${window.location.pathname}?session=${data.id}`;
+        shareElement.innerHTML = `Share this timer: <a href="${shareUrl}">${shareUrl}</a>`;
+    }
+    
+    function showSessionState(snapshot) {
+        const paused = snapshot.state === 'paused';
+        statusElement.textContent = paused ? 'Paused' : 'Counting down...';
+        pauseBtn.textContent = paused ? 'Resume' : 'Pause';
+    }
+    
+    // Pause or resume the session for everyone following it
+    function togglePause() {
+        if (!session || !sessionToken) {
+            return;
+        }
+        const action = session.snapshot.state === 'paused' ? 'resume' : 'pause';
+        TimerSync.control(session.snapshot.id, sessionToken, action)
+        .then(data => {
+            if (data.error) {
+                statusElement.textContent = data.error;
+            }
+        })
+        .catch(error => console.warn('Could not update the shared timer:', error));
+    }
+    
+    // Join a countdown someone else started
+    function joinCountdown(id) {
+        fetch(`/countdown/${id}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                displayError(data.error);
+                return;
+            }
+            totalTime = data.total_time;
+            launchTime = data.launch_time;
+            alignAlertTriggered = false;
+            bombAlertTriggered = false;
+            
+            startBtn.disabled = true;
+            stopBtn.disabled = false;
+            statusElement.textContent = 'Counting down...';
+            timerElement.style.color = 'var(--accent-color)';
+            
+            subscribeCountdown(data);
+            countdownInterval = setInterval(updateCountdown, 50);
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            displayError('Could not join the shared countdown');
+        });
+    }
+    
+    // Take alerts from the server stream instead of the local clock
+    function subscribeCountdown(data) {
+        // Align the local clock with the server's warp start
+        startTime = Date.now() - (data.server_time - data.started_at) * 1000;
+        
+        const shareUrl = `${window.location.origin}${window.location.pathname}?countdown=${data.id}`;
+        shareElement.innerHTML = `Share this timer: <a href="${shareUrl}">${shareUrl}</a>`;
+        
+        eventSource = new EventSource(`/countdown/${data.id}/events`);
+        serverAlerts = true;
+        
+        eventSource.addEventListener('sync', event => {
+            const sync = JSON.parse(event.data);
+            startTime = Date.now() - (sync.server_time - sync.started_at) * 1000;
+        });
+        
+        eventSource.addEventListener('alert', event => {
+            const alert = JSON.parse(event.data);
+            if (alert.alert === 'ALIGN' && !alignAlertTriggered) {
+                alignAlertTriggered = true;
+                triggerAlert(alert.message, 'var(--warning-color)');
+            } else if (alert.alert === 'LAUNCH' && !bombAlertTriggered) {
+                bombAlertTriggered = true;
+                triggerAlert(alert.message, 'var(--success-color)');
+            } else if (alert.alert === 'LANDING') {
+                triggerAlert(alert.message, 'var(--warning-color)');
+                stopCountdown();
+            }
+        });
+        
+        eventSource.addEventListener('end', closeEventSource);
+        eventSource.addEventListener('stopped', () => {
+            closeEventSource();
+            stopCountdown();
+        });
+        
+        // Fall back to local alerts if the stream drops for good
+        eventSource.onerror = () => {
+            if (eventSource && eventSource.readyState === EventSource.CLOSED) {
+                closeEventSource();
+            }
+        };
+    }
+    
+    function closeEventSource() {
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
+        }
+        serverAlerts = false;
     }
     
     // Update the countdown display
     function updateCountdown() {
-        const elapsed = (Date.now() - startTime) / 1000;
+        const elapsed = session ? session.elapsed() : (Date.now() - startTime) / 1000;
         const remaining = Math.max(0, launchTime - elapsed);
         
         // Update progress bar
@@ -198,6 +420,11 @@ document.addEventListener('DOMContentLoaded', function() {
         const timeString = `${hours.toString().padStart(2, '0')}:${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
         timerElement.textContent = timeString;
         
+        // Alerts come from the server stream while it is connected
+        if (serverAlerts) {
+            return;
+        }
+        
         // Check for alerts
         if (!alignAlertTriggered && remaining <= alignAlertTime) {
             triggerAlert('ALIGN NOW!', 'var(--warning-color)');
@@ -335,8 +562,25 @@ document.addEventListener('DOMContentLoaded', function() {
     // Stop the countdown timer
     function stopCountdown() {
         clearInterval(countdownInterval);
+        countdownInterval = null;
+        
+        // Stop the shared timer for everyone if we started it
+        if (session && sessionToken) {
+            TimerSync.control(session.snapshot.id, sessionToken, 'stop')
+            .catch(error => console.warn('Could not stop the shared timer:', error));
+        }
+        if (session) {
+            session.close();
+            session = null;
+        }
+        sessionToken = null;
+        closeEventSource();
+        shareElement.textContent = '';
+        
         startBtn.disabled = false;
         stopBtn.disabled = true;
+        pauseBtn.disabled = true;
+        pauseBtn.textContent = 'Pause';
         timerElement.textContent = '00:00:00';
         statusElement.textContent = 'Ready';
         progressBar.style.width = '0%';
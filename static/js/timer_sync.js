@@ -0,0 +1,107 @@
+/*
+ * Client side of the shared timer sessions (timer_sessions.py).
+ *
+ * estimateOffset() measures how far the server clock is ahead of this one
+ * from a few /time round trips, keeping the sample with the shortest round
+ * trip (its offset has the smallest possible error, half that round trip).
+ * SessionFollower renders from the latest session snapshot on the local
+ * clock plus that offset and long-polls for the next version, so nothing
+ * goes over the network between pause/resume/stop changes.
+ */
+(function (root, factory) {
+    if (typeof module === 'object' && module.exports) {
+        module.exports = factory();
+    } else {
+        root.TimerSync = factory();
+    }
+})(this, function () {
+    'use strict';
+
+    const OFFSET_SAMPLES = 5;
+    // Seconds a long-poll waits on the server before it is renewed
+    const POLL_WAIT = 25;
+    // Back-off after a failed poll, in milliseconds
+    const RETRY_DELAY = 2000;
+
+    function nowSeconds() {
+        return Date.now() / 1000;
+    }
+
+    // Server clock minus local clock in seconds, and its error bound
+    async function estimateOffset(samples = OFFSET_SAMPLES) {
+        let best = null;
+        for (let i = 0; i < samples; i++) {
+            const sent = nowSeconds();
+            const response = await fetch(`/time?client_time=${sent}`, { cache: 'no-store' });
+            const data = await response.json();
+            const received = nowSeconds();
+            const roundTrip = (received - sent) - (data.send - data.receive);
+            const offset = ((data.receive - sent) + (data.send - received)) / 2;
+            if (best === null || roundTrip < best.roundTrip) {
+                best = { offset: offset, roundTrip: roundTrip, error: roundTrip / 2 };
+            }
+        }
+        return best;
+    }
+
+    class SessionFollower {
+        // onChange(snapshot) is called with every new session version
+        constructor(snapshot, offset, onChange) {
+            this.snapshot = snapshot;
+            this.offset = offset;
+            this.onChange = onChange;
+            this.closed = false;
+            this.poll();
+        }
+
+        // Seconds since warp start, on the server's clock
+        elapsed() {
+            const s = this.snapshot;
+            if (s.state !== 'running') {
+                return s.elapsed;
+            }
+            return nowSeconds() + this.offset - s.started_at;
+        }
+
+        async poll() {
+            while (!this.closed) {
+                const s = this.snapshot;
+                try {
+                    const response = await fetch(`/sessions/${s.id}?version=${s.version}&wait=${POLL_WAIT}`,
+                                                 { cache: 'no-store' });
+                    if (response.status === 404) {
+                        this.close();
+                        this.onChange(null);
+                        return;
+                    }
+                    const next = await response.json();
+                    if (!this.closed && next.version !== s.version) {
+                        this.snapshot = next;
+                        this.onChange(next);
+                    }
+                } catch (error) {
+                    await new Promise(resolve => setTimeout(resolve, RETRY_DELAY));
+                }
+            }
+        }
+
+        close() {
+            this.closed = true;
+        }
+    }
+
+    // Pause, resume or stop a session we own
+    function control(sessionId, token, action) {
+        return fetch(`/sessions/${sessionId}/${action}`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ token: token })
+        }).then(response => response.json());
+    }
+
+    return {
+        estimateOffset: estimateOffset,
+        SessionFollower: SessionFollower,
+        control: control
+    };
+});
@@ -0,0 +1,189 @@
+/*
+ * Browser port of warp_engine.py, so the page can solve a target without a
+ * round trip to /calculate. The model is described under "Warp Model" in
+ * the README; keep this file in step with warp_engine.py and check it
+ * against the golden vectors with `python warp_vectors.py check`.
+ *
+ * Works as a plain <script> (window.WarpEngine) and as a Node module.
+ */
+(function (root, factory) {
+    if (typeof module === 'object' && module.exports) {
+        module.exports = factory();
+    } else {
+        root.WarpEngine = factory();
+    }
+})(this, function () {
+    'use strict';
+
+    const AU_IN_M = 149597870700;
+
+    // Speed at which a ship drops out of warp, in m/s
+    function warpDropoutSpeed(maxSubwarpSpeed) {
+        return Math.min(maxSubwarpSpeed / 2, 100);
+    }
+
+    // Top speed of a warp too short to reach max warp speed, in m/s
+    function shortWarpPeakSpeed(kAccel, kDecel, dropoutSpeed, warpDist) {
+        const peak = (warpDist + 1 + dropoutSpeed / kDecel) / (1 / kAccel + 1 / kDecel);
+        return Math.max(peak, kAccel, dropoutSpeed);
+    }
+
+    // Warp timing for one ship (AU/s, m/s) and distance (m)
+    class WarpProfile {
+        constructor(maxWarpSpeed, maxSubwarpSpeed, warpDist) {
+            this.warpSpeed = maxWarpSpeed;
+            this.subwarpSpeed = maxSubwarpSpeed;
+            this.warpDist = warpDist;
+
+            this.kAccel = maxWarpSpeed;
+            this.kDecel = Math.min(maxWarpSpeed / 3, 2);
+            this.warpDropoutSpeed = warpDropoutSpeed(maxSubwarpSpeed);
+            this.maxMsWarpSpeed = maxWarpSpeed * AU_IN_M;
+
+            this.peakSpeed = this.maxMsWarpSpeed;
+            this.accelDist = this.peakSpeed / this.kAccel - 1;
+            this.decelDist = (this.peakSpeed - this.warpDropoutSpeed) / this.kDecel;
+            if (warpDist >= this.accelDist + this.decelDist) {
+                // Cruise phase covers whatever distance is left at max speed
+                this.cruiseDist = warpDist - (this.accelDist + this.decelDist);
+                this.cruiseTime = this.cruiseDist / this.maxMsWarpSpeed;
+            } else {
+                // Short warp: accel and decel meet below max speed, no cruise
+                this.peakSpeed = shortWarpPeakSpeed(this.kAccel, this.kDecel, this.warpDropoutSpeed, warpDist);
+                this.accelDist = this.peakSpeed / this.kAccel - 1;
+                this.decelDist = (this.peakSpeed - this.warpDropoutSpeed) / this.kDecel;
+                this.cruiseDist = 0;
+                this.cruiseTime = 0;
+            }
+            this.accelTime = Math.log(this.peakSpeed / this.kAccel) / this.kAccel;
+            this.decelTime = Math.log(this.peakSpeed / this.warpDropoutSpeed) / this.kDecel;
+
+            // Phase boundaries
+            this.cruiseEnd = this.accelTime + this.cruiseTime;
+            this.totalTime = this.cruiseEnd + this.decelTime;
+            this.decelStartDist = this.accelDist + this.cruiseDist;
+            this.travelDist = this.decelStartDist + this.decelDist;
+        }
+
+        // Distance travelled t seconds after warp start, in meters
+        position(t) {
+            if (t <= 0) {
+                return 0;
+            }
+            if (t <= this.accelTime) {
+                return Math.exp(this.kAccel * t) - 1;
+            }
+            if (t <= this.cruiseEnd) {
+                return this.accelDist + this.peakSpeed * (t - this.accelTime);
+            }
+            if (t < this.totalTime) {
+                const timeInDecel = t - this.cruiseEnd;
+                return this.decelStartDist - (this.peakSpeed / this.kDecel) * Math.expm1(-this.kDecel * timeInDecel);
+            }
+            return this.travelDist;
+        }
+
+        // Speed t seconds after warp start, in m/s
+        speed(t) {
+            if (t <= this.accelTime) {
+                return this.kAccel * Math.exp(this.kAccel * Math.max(t, 0));
+            }
+            if (t <= this.cruiseEnd) {
+                return this.peakSpeed;
+            }
+            const timeInDecel = Math.min(t, this.totalTime) - this.cruiseEnd;
+            return this.peakSpeed * Math.exp(-this.kDecel * timeInDecel);
+        }
+
+        // Distance still to travel t seconds after warp start, in meters
+        remaining(t) {
+            if (t >= this.totalTime) {
+                return 0;
+            }
+            if (t > this.cruiseEnd) {
+                const timeLeft = this.totalTime - t;
+                return this.warpDropoutSpeed * Math.expm1(this.kDecel * timeLeft) / this.kDecel;
+            }
+            if (t > this.accelTime) {
+                return this.decelDist + this.peakSpeed * (this.cruiseEnd - t);
+            }
+            return this.travelDist - this.position(t);
+        }
+
+        // Launch so the remaining flight time equals the detonation time
+        launch(detonationTime) {
+            const launchTime = this.totalTime - detonationTime;
+            return {
+                launchTime: launchTime,
+                distanceRemaining: this.remaining(launchTime),
+                currentSpeed: this.speed(launchTime)
+            };
+        }
+    }
+
+    // Python's str() of a float for the values the page shows
+    function pyFloat(x) {
+        return Number.isInteger(x) ? x.toFixed(1) : String(x);
+    }
+
+    // Python's '{:.<digits>f}': like toFixed, but exact halves round to even
+    function fixed(x, digits) {
+        const exact = Math.abs(x).toFixed(100);
+        const point = exact.indexOf('.');
+        const rest = exact.slice(point + 1 + digits);
+        if (!/^50*$/.test(rest)) {
+            return x.toFixed(digits);
+        }
+        const kept = exact.slice(0, point + 1 + digits).replace(/\.$/, '');
+        const lastDigit = Number(kept.replace('.', '').slice(-1));
+        const magnitude = Number(kept) + (lastDigit % 2 ? Math.pow(10, -digits) : 0);
+        return (x < 0 ? '-' : '') + magnitude.toFixed(digits);
+    }
+
+    // Python's '{:,.<digits>f}'
+    function grouped(x, digits) {
+        const text = fixed(x, digits);
+        const [whole, fraction] = text.split('.');
+        return whole.replace(/\B(?=(\d{3})+(?!\d))/g, ',') + (fraction ? '.' + fraction : '');
+    }
+
+    // The display-formatted /calculate response for one target
+    function calculate(distanceAu, warpSpeed, subwarpSpeed, detonationTime) {
+        const distanceM = distanceAu * AU_IN_M;
+        const profile = new WarpProfile(warpSpeed, subwarpSpeed, distanceM);
+        const timing = profile.launch(detonationTime);
+        const km = meters => grouped(meters / 1000, 0);
+        return {
+            target_info: {
+                warp_distance: `${fixed(distanceAu, 2)} AU (${km(distanceM)} km)`,
+                warp_speed: `${pyFloat(warpSpeed)} AU/s`,
+                subwarp_speed: `${pyFloat(subwarpSpeed)} m/s`,
+                detonation_time: `${pyFloat(detonationTime)} seconds`
+            },
+            warp_time: {
+                accel_phase: `${fixed(profile.accelTime, 2)} seconds (distance: ${km(profile.accelDist)} km)`,
+                cruise_phase: `${fixed(profile.cruiseTime, 2)} seconds (distance: ${km(profile.cruiseDist)} km)`,
+                decel_phase: `${fixed(profile.decelTime, 2)} seconds (distance: ${km(profile.decelDist)} km)`,
+                total_time: `${fixed(profile.totalTime, 2)} seconds`
+            },
+            bomb_timing: {
+                launch_time: `${fixed(timing.launchTime, 2)} seconds after warp start`,
+                time_before_landing: `${fixed(detonationTime, 2)} seconds before landing`,
+                distance_remaining: `${fixed((timing.distanceRemaining / AU_IN_M), 4)} AU (${km(timing.distanceRemaining)} km)`,
+                current_speed: `${grouped(timing.currentSpeed, 0)} m/s (${fixed((timing.currentSpeed / AU_IN_M), 2)} AU/s)`
+            },
+            countdown: {
+                total_time: profile.totalTime,
+                launch_time: timing.launchTime
+            }
+        };
+    }
+
+    return {
+        AU_IN_M: AU_IN_M,
+        warpDropoutSpeed: warpDropoutSpeed,
+        shortWarpPeakSpeed: shortWarpPeakSpeed,
+        WarpProfile: WarpProfile,
+        calculate: calculate
+    };
+});
@@ -0,0 +1,313 @@
+"""
+Shared fleet timers that can be paused and resumed.
+
+An FC creates a session for a target and shares its id; every bomber
+joins it, estimates their clock offset to the server with /time and renders
+the countdown locally from the session snapshot. A snapshot only changes
+on create, pause, resume and stop, and each change bumps its version, so
+clients long-poll for the next version instead of streaming ticks.
+
+Sessions are slotted objects in one dict behind one lock. With a database
+path every change is also written through to SQLite and live sessions are
+reloaded on startup. Change notifications stay in-process, so run the
+sessions on a single server process (uvicorn, or gunicorn with one worker).
+"""
+import asyncio
+import functools
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import time
+import uuid
+from threading import Event, Lock
+
+# SQLite file for persistent sessions; unset keeps them in memory only
+SESSION_DB_PATH = os.environ.get('TICKBOMB_SESSION_DB')
+# Running and stopped sessions are dropped this many seconds after they end
+SESSION_EXPIRY = 300
+# Paused sessions are dropped after this long without a change
+PAUSED_SESSION_EXPIRY = 3600
+# Expired sessions are swept at most this often, in seconds
+PRUNE_INTERVAL = 30
+# Long-poll bounds, in seconds
+DEFAULT_WAIT = 25
+MAX_WAIT = 60
+
+RUNNING = 'running'
+PAUSED = 'paused'
+STOPPED = 'stopped'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timer_sessions (
+    id TEXT PRIMARY KEY,
+    token TEXT NOT NULL,
+    target TEXT NOT NULL,
+    total_time REAL NOT NULL,
+    launch_time REAL NOT NULL,
+    align_alert REAL NOT NULL,
+    bomb_alert REAL NOT NULL,
+    state TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    paused_elapsed REAL NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL
+)
+"""
+COLUMNS = ('id', 'token', 'target', 'total_time', 'launch_time', 'align_alert', 'bomb_alert',
+           'state', 'started_at', 'paused_elapsed', 'version', 'updated_at')
+
+
+class TimerSession:
+    """
+    One shared timer on the server clock.
+
+    While running, warp start is at started_at (time.time()); while paused
+    the timer is frozen at paused_elapsed seconds after warp start. Resuming
+    moves started_at so the timer carries on from where it was paused.
+
+    Args:
+        target: Dict of the target inputs, echoed to clients
+        total_time: Total warp time in seconds
+        launch_time: Launch time in seconds after warp start
+        align_alert: Seconds before launch to raise the align alert
+        bomb_alert: Seconds before launch to raise the bomb alert
+        paused: Create the session paused at warp start, to be resumed later
+        now: Server time of creation
+    """
+    __slots__ = ('id', 'token', 'target', 'total_time', 'launch_time', 'align_alert', 'bomb_alert',
+                 'state', 'started_at', 'paused_elapsed', 'version', 'updated_at')
+
+    def __init__(self, target, total_time, launch_time, align_alert, bomb_alert, paused=False, now=None):
+        now = time.time() if now is None else now
+        self.id = uuid.uuid4().hex[:12]
+        self.token = secrets.token_urlsafe(16)
+        self.target = target
+        self.total_time = total_time
+        self.launch_time = launch_time
+        self.align_alert = align_alert
+        self.bomb_alert = bomb_alert
+        self.state = PAUSED if paused else RUNNING
+        self.started_at = now
+        self.paused_elapsed = 0.0
+        self.version = 1
+        self.updated_at = now
+
+    @classmethod
+    def from_row(cls, row):
+        session = cls.__new__(cls)
+        for name, value in zip(COLUMNS, row):
+            setattr(session, name, value)
+        session.target = json.loads(session.target)
+        return session
+
+    def row(self):
+        return tuple(json.dumps(self.target) if name == 'target' else getattr(self, name) for name in COLUMNS)
+
+    def elapsed(self, now):
+        """
+        Seconds since warp start at server time now
+        """
+        if self.state == RUNNING:
+            return now - self.started_at
+        return self.paused_elapsed
+
+    def expires_at(self):
+        if self.state == PAUSED:
+            return self.updated_at + PAUSED_SESSION_EXPIRY
+        if self.state == STOPPED:
+            return self.updated_at + SESSION_EXPIRY
+        return self.started_at + self.total_time + SESSION_EXPIRY
+
+    def apply(self, action, now):
+        """
+        Pause, resume or stop the timer
+
+        Raises:
+            ValueError: If the action doesn't apply in the current state
+        """
+        if self.state == STOPPED:
+            raise ValueError('Session has been stopped.')
+        if action == 'pause':
+            if self.state != RUNNING:
+                raise ValueError('Session is not running.')
+            if now - self.started_at >= self.total_time:
+                raise ValueError('Target has already landed.')
+            self.paused_elapsed = now - self.started_at
+            self.state = PAUSED
+        elif action == 'resume':
+            if self.state != PAUSED:
+                raise ValueError('Session is not paused.')
+            self.started_at = now - self.paused_elapsed
+            self.state = RUNNING
+        elif action == 'stop':
+            self.paused_elapsed = min(self.elapsed(now), self.total_time)
+            self.state = STOPPED
+        else:
+            raise ValueError(f"Unknown action '{action}'.")
+        self.version += 1
+        self.updated_at = now
+
+    def snapshot(self, now=None):
+        """
+        JSON-friendly state for clients; everything needed to render the
+        countdown locally, without the control token
+        """
+        now = time.time() if now is None else now
+        return {
+            'id': self.id,
+            'version': self.version,
+            'state': self.state,
+            'server_time': now,
+            'started_at': self.started_at,
+            'elapsed': self.elapsed(now),
+            'total_time': self.total_time,
+            'launch_time': self.launch_time,
+            'align_alert': self.align_alert,
+            'bomb_alert': self.bomb_alert,
+            'target': self.target,
+        }
+
+
+class SessionStore:
+    """
+    In-memory session store with optional SQLite write-through
+
+    Args:
+        path: SQLite database file, or None to keep sessions in memory only
+    """
+
+    def __init__(self, path=SESSION_DB_PATH):
+        self._sessions = {}
+        # session id -> callables that wake the clients waiting on it
+        self._waiters = {}
+        self._lock = Lock()
+        self._next_prune = 0.0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.execute(SCHEMA)
+            for row in self._db.execute(f"SELECT {', '.join(COLUMNS)} FROM timer_sessions"):
+                session = TimerSession.from_row(row)
+                self._sessions[session.id] = session
+            with self._lock:
+                self._prune(time.time())
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def add(self, session):
+        with self._lock:
+            self._prune(time.time())
+            self._sessions[session.id] = session
+            self._save(session)
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def control(self, session_id, token, action, now=None):
+        """
+        Apply a pause/resume/stop from the session's owner and wake its
+        waiting clients
+
+        Returns:
+            The session, or None if it doesn't exist
+
+        Raises:
+            PermissionError: If token isn't the session's control token
+            ValueError: If the action doesn't apply in the current state
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if not hmac.compare_digest(session.token, str(token or '')):
+                raise PermissionError('Invalid session token.')
+            session.apply(action, now)
+            self._save(session)
+            for wake in self._waiters.pop(session_id, ()):
+                wake()
+        return session
+
+    def wait(self, session_id, version, timeout=DEFAULT_WAIT):
+        """
+        Block until the session moves past version or timeout seconds pass
+
+        Returns:
+            The session (possibly unchanged), or None if it doesn't exist
+        """
+        event = Event()
+        if not self._register(session_id, version, event.set):
+            return self.get(session_id)
+        try:
+            event.wait(timeout)
+        finally:
+            self._unregister(session_id, event.set)
+        return self.get(session_id)
+
+    async def async_wait(self, session_id, version, timeout=DEFAULT_WAIT):
+        """
+        wait() for the event loop: a waiting client costs a coroutine, not
+        a thread
+        """
+        event = asyncio.Event()
+        wake = functools.partial(asyncio.get_running_loop().call_soon_threadsafe, event.set)
+        if not self._register(session_id, version, wake):
+            return self.get(session_id)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._unregister(session_id, wake)
+        return self.get(session_id)
+
+    def stats(self):
+        """
+        Session counts by state and number of waiting clients
+        """
+        with self._lock:
+            counts = {RUNNING: 0, PAUSED: 0, STOPPED: 0}
+            for session in self._sessions.values():
+                counts[session.state] += 1
+            counts['waiting'] = sum(len(waiters) for waiters in self._waiters.values())
+        return counts
+
+    def _register(self, session_id, version, wake):
+        # False when there is nothing to wait for: unknown session or a
+        # version the client hasn't seen yet
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or session.version != version:
+                return False
+            self._waiters.setdefault(session_id, set()).add(wake)
+        return True
+
+    def _unregister(self, session_id, wake):
+        with self._lock:
+            waiters = self._waiters.get(session_id)
+            if waiters is not None:
+                waiters.discard(wake)
+                if not waiters:
+                    del self._waiters[session_id]
+
+    def _save(self, session):
+        if self._db is not None:
+            self._db.execute(f"INSERT OR REPLACE INTO timer_sessions VALUES ({', '.join('?' * len(COLUMNS))})",
+                             session.row())
+
+    def _prune(self, now):
+        if now < self._next_prune:
+            return
+        self._next_prune = now + PRUNE_INTERVAL
+        expired = [key for key, session in self._sessions.items() if session.expires_at() < now]
+        for key in expired:
+            del self._sessions[key]
+        if expired and self._db is not None:
+            self._db.executemany('DELETE FROM timer_sessions WHERE id = ?', [(key,) for key in expired])
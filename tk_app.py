@@ -0,0 +1,441 @@
+"""
+Tk frontends: the full calculator window and the compact overlay timer.
+
+Only imported once a window is opened (see main.py), so the solver and
+the command line never pay for tkinter.
+"""
+import math
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from scheduler import DeadlineScheduler
+from warp_engine import AU_IN_M, WarpProfile
+from warp_report import report_sections
+
+# Colors shared by both windows
+BG_COLOR = "#121212"
+FRAME_COLOR = "#1E1E1E"
+TEXT_COLOR = "#FFFFFF"
+ACCENT_COLOR = "#4A90E2"
+WARNING_COLOR = "#FF5555"
+SUCCESS_COLOR = "#55FF55"
+
+class CountdownTimer:
+    """
+    Countdown to self.launch_time on a DeadlineScheduler, shared by the
+    calculator and the overlay. The display only refreshes when the shown
+    second changes and alerts fire at their exact instants, so an idle
+    countdown wakes about once a second.
+    
+    Subclasses call init_countdown() and provide alert_times() (None when
+    the alert settings are invalid, after telling the user),
+    countdown_started(), countdown_stopped(), show_remaining() and
+    trigger_alert().
+    """
+    warning_color = WARNING_COLOR
+    success_color = SUCCESS_COLOR
+    normal_color = ACCENT_COLOR
+    
+    def init_countdown(self, root):
+        self.running = False
+        self.scheduler = DeadlineScheduler(root.after, root.after_cancel)
+        self.paused = False
+        self.pause_time = 0
+    
+    def start_countdown(self):
+        """
+        Start the countdown timer
+        """
+        if not hasattr(self, 'launch_time'):
+            messagebox.showwarning("Warning", "Please calculate first before starting countdown.")
+            return
+        
+        # Read the alert settings before changing any state, so bad input
+        # leaves the controls as they were
+        alerts = self.alert_times()
+        if alerts is None:
+            return
+        align_alert, bomb_alert = alerts
+        
+        if self.paused:
+            remaining_time = self.pause_time
+        else:
+            remaining_time = self.launch_time
+        
+        self.running = True
+        self.paused = False
+        self.countdown_started()
+        
+        # Warp start and launch as deadlines on the scheduler clock
+        self.scheduler.cancel_all()
+        self.countdown_start = self.scheduler.clock() - (self.launch_time - remaining_time)
+        self.launch_at = self.countdown_start + self.launch_time
+        self.shown_seconds = None
+        
+        # Alerts fire at their exact instants; past ones fire right away
+        self.scheduler.schedule(self.launch_at - align_alert, self.fire_alert, "ALIGN NOW!", self.warning_color)
+        self.scheduler.schedule(self.launch_at - bomb_alert, self.fire_alert, "LAUNCH BOMB!", self.success_color)
+        self.scheduler.schedule(self.launch_at, self.finish_countdown)
+        self.update_countdown_display()
+    
+    def stop_countdown(self):
+        """
+        Stop the countdown timer
+        """
+        self.running = False
+        self.paused = False
+        self.scheduler.cancel_all()
+        self.countdown_stopped()
+    
+    def update_countdown_display(self, lateness=0.0):
+        """
+        Refresh the timer and progress bar, then schedule the next refresh
+        for when the displayed seconds value changes
+        
+        Args:
+            lateness: Seconds this refresh ran after its deadline
+        """
+        if not self.running:
+            return
+        
+        now = self.scheduler.clock()
+        remaining_time = max(0, self.launch_at - now)
+        self.pause_time = remaining_time
+        
+        if int(remaining_time) != self.shown_seconds:
+            self.shown_seconds = int(remaining_time)
+            hours, remainder = divmod(self.shown_seconds, 3600)
+            minutes, seconds = divmod(remainder, 60)
+            self.show_remaining(f"{hours:02d}:{minutes:02d}:{seconds:02d}", now - self.countdown_start)
+        
+        # The display next changes once remaining drops below the next whole
+        # second; the deadline comes from launch_at, so lateness doesn't drift
+        if remaining_time > 0:
+            next_whole_second = math.ceil(remaining_time) - 1
+            self.scheduler.schedule(self.launch_at - next_whole_second, self.update_countdown_display)
+    
+    def fire_alert(self, message, color, lateness=0.0):
+        """
+        Scheduler callback for a timed alert
+        
+        Args:
+            message: Message to display
+            color: Color to use for the alert
+            lateness: Seconds the alert ran after its deadline
+        """
+        if self.running:
+            self.trigger_alert(message, color)
+    
+    def finish_countdown(self, lateness=0.0):
+        """
+        Scheduler callback for the end of the countdown
+        
+        Args:
+            lateness: Seconds this ran after launch time
+        """
+        if self.running:
+            self.trigger_alert("TARGET LANDING!", self.warning_color)
+            self.stop_countdown()
+
+class TickBombingApp(CountdownTimer):
+    def __init__(self, root):
+        self.root = root
+        self.root.title("EVE Tick Bombing Calculator")
+        self.root.geometry("650x650")
+        self.root.resizable(False, False)
+        
+        # Colors
+        self.bg_color = BG_COLOR
+        self.frame_color = FRAME_COLOR
+        self.text_color = TEXT_COLOR
+        self.accent_color = ACCENT_COLOR
+        
+        # Try to set the icon
+        try:
+            self.root.iconbitmap("assets/app_icon.ico")
+        except:
+            pass  # Ignore if icon not found
+        
+        self.setup_ui()
+        self.init_countdown(self.root)
+        
+    def setup_ui(self):
+        style = ttk.Style()
+        style.theme_use('clam')
+        
+        # Configure colors
+        self.root.configure(bg=self.bg_color)
+        style.configure('TFrame', background=self.frame_color)
+        style.configure('TLabel', background=self.frame_color, foreground=self.text_color)
+        style.configure('TButton', background=self.accent_color, foreground=self.text_color)
+        style.configure('TEntry', fieldbackground="#2D2D2D", foreground=self.text_color)
+        style.configure('Horizontal.TProgressbar', background=self.accent_color)
+        style.configure('TLabelframe', background=self.frame_color, foreground=self.text_color)
+        style.configure('TLabelframe.Label', background=self.frame_color, foreground=self.accent_color)
+        
+        # Main container
+        main_frame = ttk.Frame(self.root, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Input section
+        input_frame = ttk.LabelFrame(main_frame, text="Input Parameters", padding="10")
+        input_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Input fields
+        ttk.Label(input_frame, text="Target Warp Distance (AU):").grid(row=0, column=0, sticky=tk.W, pady=2)
+        self.distance_entry = ttk.Entry(input_frame)
+        self.distance_entry.grid(row=0, column=1, sticky=tk.EW, pady=2)
+        
+        ttk.Label(input_frame, text="Target Warp Speed (AU/s):").grid(row=1, column=0, sticky=tk.W, pady=2)
+        self.warp_speed_entry = ttk.Entry(input_frame)
+        self.warp_speed_entry.grid(row=1, column=1, sticky=tk.EW, pady=2)
+        
+        ttk.Label(input_frame, text="Target Sub Warp Speed (m/s):").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.subwarp_speed_entry = ttk.Entry(input_frame)
+        self.subwarp_speed_entry.grid(row=2, column=1, sticky=tk.EW, pady=2)
+        
+        ttk.Label(input_frame, text="Bomb Detonation Time (s):").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.detonation_entry = ttk.Entry(input_frame)
+        self.detonation_entry.grid(row=3, column=1, sticky=tk.EW, pady=2)
+        
+        ttk.Label(input_frame, text="Align Alert (seconds before):").grid(row=4, column=0, sticky=tk.W, pady=2)
+        self.align_alert_entry = ttk.Entry(input_frame)
+        self.align_alert_entry.insert(0, "3")
+        self.align_alert_entry.grid(row=4, column=1, sticky=tk.EW, pady=2)
+        
+        ttk.Label(input_frame, text="Bomb Alert (seconds before):").grid(row=5, column=0, sticky=tk.W, pady=2)
+        self.bomb_alert_entry = ttk.Entry(input_frame)
+        self.bomb_alert_entry.insert(0, "1")
+        self.bomb_alert_entry.grid(row=5, column=1, sticky=tk.EW, pady=2)
+        
+        # Button row
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.calc_button = ttk.Button(button_frame, text="Calculate", command=self.calculate)
+        self.calc_button.pack(side=tk.LEFT, padx=5)
+        
+        self.start_button = ttk.Button(button_frame, text="Start Timer", command=self.start_countdown, state=tk.DISABLED)
+        self.start_button.pack(side=tk.LEFT, padx=5)
+        
+        self.stop_button = ttk.Button(button_frame, text="Stop Timer", command=self.stop_countdown, state=tk.DISABLED)
+        self.stop_button.pack(side=tk.LEFT, padx=5)
+        
+        # Timer display section
+        timer_frame = ttk.Frame(main_frame)
+        timer_frame.pack(fill=tk.X, pady=(10, 5))
+        
+        # Digital display frame
+        digital_frame = ttk.Frame(timer_frame)
+        digital_frame.pack()
+        
+        self.countdown_var = tk.StringVar(value="00:00:00")
+        self.countdown_label = ttk.Label(digital_frame, textvariable=self.countdown_var, 
+                                      font=('Helvetica', 24), background=self.frame_color, 
+                                      foreground=self.normal_color)
+        self.countdown_label.pack()
+        
+        # Status message
+        self.status_var = tk.StringVar(value="Ready")
+        status_label = ttk.Label(timer_frame, textvariable=self.status_var, 
+                               font=('Helvetica', 12), background=self.frame_color,
+                               foreground=self.text_color)
+        status_label.pack(pady=(5, 0))
+        
+        # Progress bar
+        self.progress = ttk.Progressbar(timer_frame, orient='horizontal', length=400, mode='determinate')
+        self.progress.pack(pady=(10, 0))
+        
+        # Results section
+        results_frame = ttk.LabelFrame(main_frame, text="Results", padding="10")
+        results_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Create a text widget for results with better formatting
+        self.results_text = tk.Text(results_frame, height=12, bg="#2D2D2D", fg=self.text_color, 
+                                  font=('Consolas', 10), padx=10, pady=10, wrap=tk.WORD)
+        scrollbar = ttk.Scrollbar(results_frame, orient="vertical", command=self.results_text.yview)
+        self.results_text.configure(yscrollcommand=scrollbar.set)
+        
+        scrollbar.pack(side="right", fill="y")
+        self.results_text.pack(side="left", fill="both", expand=True)
+        
+        # Configure text tags for results display
+        self.results_text.tag_configure("section_title", foreground="#4A90E2", font=('Helvetica', 10, 'bold'))
+        
+        # Set default values
+        self.distance_entry.insert(0, "1")  # 1 AU
+        self.warp_speed_entry.insert(0, "5")
+        self.subwarp_speed_entry.insert(0, "200")
+        self.detonation_entry.insert(0, "5")
+    
+    def calculate(self):
+        """
+        Calculate all warp parameters and bomb launch timing based on user inputs
+        """
+        try:
+            # Get input values
+            distance_au = float(self.distance_entry.get())
+            distance_m = distance_au * AU_IN_M
+            warp_speed = float(self.warp_speed_entry.get())
+            subwarp_speed = float(self.subwarp_speed_entry.get())
+            detonation_time = float(self.detonation_entry.get())
+            
+            # Validate inputs
+            if distance_au <= 0 or warp_speed <= 0 or subwarp_speed <= 0 or detonation_time <= 0:
+                messagebox.showerror("Input Error", "All values must be greater than zero.")
+                return
+            
+            # Calculate warp parameters and launch timing
+            profile = WarpProfile(warp_speed, subwarp_speed, distance_m)
+            timing = profile.launch(detonation_time)
+            
+            # Format results in a clean, readable way
+            self.results_text.config(state=tk.NORMAL)
+            self.results_text.delete(1.0, tk.END)
+            
+            # Add colored sections
+            for title, items in report_sections(distance_au, warp_speed, subwarp_speed, detonation_time,
+                                                profile, timing):
+                self.add_result_section(title, items)
+            
+            self.results_text.config(state=tk.DISABLED)
+            
+            # Store values for countdown
+            self.launch_time = timing.launch_time
+            self.total_time = profile.total_time
+            self.detonation_time = detonation_time
+            
+            # Enable timer controls
+            self.start_button.config(state=tk.NORMAL)
+            self.stop_button.config(state=tk.DISABLED)
+            
+            # Reset progress bar
+            self.progress['maximum'] = profile.total_time
+            self.progress['value'] = 0
+            
+        except ValueError as e:
+            messagebox.showerror("Input Error", "Please enter valid numbers in all fields.")
+    
+    def add_result_section(self, title, items):
+        """
+        Add a formatted section to the results display
+        
+        Args:
+            title: Section title
+            items: List of text items to display in the section
+        """
+        self.results_text.insert(tk.END, f"{title}\n", "section_title")
+        for item in items:
+            self.results_text.insert(tk.END, f"  {item}\n")
+        self.results_text.insert(tk.END, "\n")
+    
+    def alert_times(self):
+        try:
+            align_alert = float(self.align_alert_entry.get())
+            bomb_alert = float(self.bomb_alert_entry.get())
+        except ValueError:
+            messagebox.showerror("Input Error", "Please enter valid numbers for the alert times.")
+            return None
+        if not (math.isfinite(align_alert) and math.isfinite(bomb_alert)) or align_alert < 0 or bomb_alert < 0:
+            messagebox.showerror("Input Error", "Alert times must be zero or more seconds.")
+            return None
+        return align_alert, bomb_alert
+    
+    def countdown_started(self):
+        self.start_button.config(state=tk.DISABLED)
+        self.stop_button.config(state=tk.NORMAL)
+        self.status_var.set("Counting down...")
+        self.countdown_label.config(foreground=self.normal_color)
+    
+    def countdown_stopped(self):
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+        self.countdown_var.set("00:00:00")
+        self.status_var.set("Ready")
+        self.progress['value'] = 0
+        self.countdown_label.config(foreground=self.normal_color)
+    
+    def show_remaining(self, text, elapsed):
+        self.countdown_var.set(text)
+        self.progress.configure(value=min(elapsed, self.total_time))
+    
+    def trigger_alert(self, message, color):
+        """
+        Trigger a visual alert on the UI
+        
+        Args:
+            message: Message to display
+            color: Color to use for the alert
+        """
+        self.status_var.set(message)
+        self.countdown_label.config(foreground=color)
+
+class OverlayApp(CountdownTimer):
+    """
+    Minimal always-on-top countdown for running next to the game client:
+    two labels and no ttk styling or results text.
+    
+    Space or a click starts and stops the timer, Escape closes the window.
+    
+    Args:
+        root: Tk root window
+        launch_time: Launch time in seconds after warp start
+        align_alert: Seconds before launch to raise the align alert
+        bomb_alert: Seconds before launch to raise the bomb alert
+        label: Short description of the target for the title bar
+    """
+    def __init__(self, root, launch_time, align_alert=3, bomb_alert=1, label=""):
+        self.root = root
+        self.launch_time = launch_time
+        self.align_alert = align_alert
+        self.bomb_alert = bomb_alert
+        
+        self.root.title(f"Tick Bomb {label}".strip())
+        self.root.configure(bg=BG_COLOR)
+        self.root.resizable(False, False)
+        self.root.attributes('-topmost', True)
+        try:
+            self.root.attributes('-alpha', 0.85)
+        except tk.TclError:
+            pass  # No window transparency on this platform
+        
+        self.countdown_var = tk.StringVar()
+        self.status_var = tk.StringVar(value="Space to start")
+        self.countdown_label = tk.Label(self.root, textvariable=self.countdown_var, font=('Helvetica', 22),
+                                        bg=BG_COLOR, fg=self.normal_color, padx=12)
+        self.countdown_label.pack()
+        tk.Label(self.root, textvariable=self.status_var, font=('Helvetica', 10),
+                 bg=BG_COLOR, fg=TEXT_COLOR).pack(pady=(0, 4))
+        
+        self.root.bind('<space>', self.toggle)
+        self.root.bind('<Button-1>', self.toggle)
+        self.root.bind('<Escape>', lambda event: self.root.destroy())
+        
+        self.init_countdown(self.root)
+        self.countdown_stopped()
+    
+    def toggle(self, event=None):
+        if self.running:
+            self.stop_countdown()
+        else:
+            self.start_countdown()
+    
+    def alert_times(self):
+        return self.align_alert, self.bomb_alert
+    
+    def countdown_started(self):
+        self.status_var.set("Counting down...")
+        self.countdown_label.config(fg=self.normal_color)
+    
+    def countdown_stopped(self):
+        seconds = int(math.ceil(max(self.launch_time, 0)))
+        minutes, seconds = divmod(seconds, 60)
+        self.countdown_var.set(f"{minutes:02d}:{seconds:02d}")
+        self.countdown_label.config(fg=self.normal_color)
+    
+    def show_remaining(self, text, elapsed):
+        self.countdown_var.set(text[3:] if text.startswith("00:") else text)
+    
+    def trigger_alert(self, message, color):
+        self.status_var.set(message)
+        self.countdown_label.config(fg=color)
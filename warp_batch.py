@@ -0,0 +1,185 @@
+import math
+
+import numpy as np
+
+from warp_engine import AU_IN_M, DEFAULT_TICK_LENGTH, TICK_EPSILON
+
+# Upper bound on rows accepted by a single batch request
+MAX_BATCH_ROWS = 10000
+
+# Batch row field order when a row is sent as a plain array
+BATCH_FIELDS = ('distance', 'warp_speed', 'subwarp_speed', 'detonation_time')
+BATCH_DEFAULTS = {'distance': 1, 'warp_speed': 5, 'subwarp_speed': 200, 'detonation_time': 5}
+
+
+def parse_batch_row(row):
+    """
+    Turn one batch row (object or [distance, warp_speed, subwarp_speed, detonation_time])
+    into a tuple of floats, raising ValueError on bad input
+    """
+    if isinstance(row, dict):
+        values = tuple(float(row.get(field, BATCH_DEFAULTS[field])) for field in BATCH_FIELDS)
+    elif isinstance(row, (list, tuple)) and len(row) == len(BATCH_FIELDS):
+        values = tuple(float(value) for value in row)
+    else:
+        raise ValueError('Row must be an object or a 4-element array.')
+
+    if not all(math.isfinite(value) and value > 0 for value in values):
+        raise ValueError('All values must be greater than zero.')
+    return values
+
+
+def calculate_time_in_warp_batch(max_warp_speed, max_subwarp_speed, warp_dist):
+    """
+    Vectorized WarpProfile phase constants over equal-length arrays.
+
+    Mirrors warp_engine.WarpProfile; keep the two in step.
+
+    Args:
+        max_warp_speed: Array of maximum warp speeds in AU/s
+        max_subwarp_speed: Array of maximum sub-warp speeds in m/s
+        warp_dist: Array of warp distances in meters
+
+    Returns:
+        Dict of arrays with the same fields as the scalar tuple
+    """
+    k_accel = max_warp_speed
+    k_decel = np.minimum(max_warp_speed / 3, 2)
+    warp_dropout_speed = np.minimum(max_subwarp_speed / 2, 100)
+    max_ms_warp_speed = max_warp_speed * AU_IN_M
+
+    # Short warps peak below max speed (see warp_engine.short_warp_peak_speed)
+    full_accel_dist = max_ms_warp_speed / k_accel - 1
+    full_decel_dist = (max_ms_warp_speed - warp_dropout_speed) / k_decel
+    short_peak = (warp_dist + 1 + warp_dropout_speed / k_decel) / (1 / k_accel + 1 / k_decel)
+    short_peak = np.maximum(short_peak, np.maximum(k_accel, warp_dropout_speed))
+    peak_speed = np.where(warp_dist >= full_accel_dist + full_decel_dist, max_ms_warp_speed, short_peak)
+
+    # Acceleration phase
+    accel_time = np.log(peak_speed / k_accel) / k_accel
+    accel_dist = peak_speed / k_accel - 1
+
+    # Deceleration phase
+    decel_time = np.log(peak_speed / warp_dropout_speed) / k_decel
+    decel_dist = (peak_speed - warp_dropout_speed) / k_decel
+
+    # Cruise phase
+    cruise_dist = np.maximum(0, warp_dist - (accel_dist + decel_dist))
+    cruise_time = cruise_dist / max_ms_warp_speed
+
+    return {
+        'total_time': accel_time + cruise_time + decel_time,
+        'accel_time': accel_time,
+        'cruise_time': cruise_time,
+        'decel_time': decel_time,
+        'accel_dist': accel_dist,
+        'cruise_dist': cruise_dist,
+        'decel_dist': decel_dist,
+        'k_accel': k_accel,
+        'k_decel': k_decel,
+        'max_ms_warp_speed': max_ms_warp_speed,
+        'warp_dropout_speed': warp_dropout_speed,
+        'peak_speed': peak_speed,
+    }
+
+
+def solve_batch(distance_au, warp_speed, subwarp_speed, detonation_time):
+    """
+    Solve warp phases and bomb launch timing for many targets in one pass.
+
+    Args:
+        distance_au: Array of warp distances in AU
+        warp_speed: Array of warp speeds in AU/s
+        subwarp_speed: Array of sub-warp speeds in m/s
+        detonation_time: Array of bomb detonation times in seconds
+
+    Returns:
+        Dict of float64 arrays, one entry per row
+    """
+    distance_au = np.asarray(distance_au, dtype=np.float64)
+    warp_speed = np.asarray(warp_speed, dtype=np.float64)
+    subwarp_speed = np.asarray(subwarp_speed, dtype=np.float64)
+    detonation_time = np.asarray(detonation_time, dtype=np.float64)
+
+    warp = calculate_time_in_warp_batch(warp_speed, subwarp_speed, distance_au * AU_IN_M)
+    k_accel = warp['k_accel']
+    k_decel = warp['k_decel']
+    peak_speed = warp['peak_speed']
+    accel_time = warp['accel_time']
+    cruise_end = accel_time + warp['cruise_time']
+    total_time = warp['total_time']
+    travel_dist = warp['accel_dist'] + warp['cruise_dist'] + warp['decel_dist']
+
+    launch_time = total_time - detonation_time
+
+    # Distance left at launch, per phase the launch falls in (see WarpProfile.remaining)
+    in_accel = launch_time <= accel_time
+    in_cruise = ~in_accel & (launch_time <= cruise_end)
+    accel_position = np.expm1(k_accel * np.clip(launch_time, 0, accel_time))
+    distance_remaining = np.select(
+        [in_accel, in_cruise],
+        [travel_dist - accel_position,
+         warp['decel_dist'] + peak_speed * (cruise_end - launch_time)],
+        warp['warp_dropout_speed'] * np.expm1(k_decel * np.clip(detonation_time, 0, None)) / k_decel)
+
+    # Speed at launch time, picked per row from the phase the launch falls in
+    current_speed = np.select(
+        [in_accel, in_cruise],
+        [k_accel * np.exp(k_accel * np.clip(launch_time, 0, accel_time)), peak_speed],
+        peak_speed * np.exp(-k_decel * (np.minimum(launch_time, total_time) - cruise_end)))
+
+    return {
+        'total_time': warp['total_time'],
+        'peak_speed': peak_speed,
+        'accel_time': accel_time,
+        'cruise_time': warp['cruise_time'],
+        'decel_time': warp['decel_time'],
+        'accel_dist': warp['accel_dist'],
+        'cruise_dist': warp['cruise_dist'],
+        'decel_dist': warp['decel_dist'],
+        'launch_time': launch_time,
+        'distance_remaining': distance_remaining,
+        'current_speed': current_speed,
+    }
+
+
+def tick_align_batch(total_time, detonation_time, tick_length=DEFAULT_TICK_LENGTH, tick_offset=0.0):
+    """
+    Vectorized warp_engine.TickTiming for many targets on one tick grid.
+
+    Args:
+        total_time: Array of total warp times in seconds
+        detonation_time: Array of bomb detonation times in seconds
+        tick_length: Server tick length in seconds
+        tick_offset: Time of a tick boundary relative to the warp command
+
+    Returns:
+        Dict of arrays with the TickTiming.as_dict fields
+    """
+    if tick_length <= 0:
+        raise ValueError('Tick length must be greater than zero.')
+    total_time = np.asarray(total_time, dtype=np.float64)
+    detonation_time = np.asarray(detonation_time, dtype=np.float64)
+    tick_offset = tick_offset % tick_length
+
+    def next_tick(t):
+        return np.ceil((t - tick_offset) / tick_length - TICK_EPSILON).astype(np.int64)
+
+    warp_start_tick = int(np.ceil(-tick_offset / tick_length - TICK_EPSILON))
+    warp_start_time = tick_offset + warp_start_tick * tick_length
+    landing_tick = next_tick(warp_start_time + total_time)
+    detonation_ticks = np.ceil(detonation_time / tick_length - TICK_EPSILON).astype(np.int64)
+    launch_tick = landing_tick - detonation_ticks
+    unsnapped_detonation_tick = next_tick(warp_start_time + total_time - detonation_time) + detonation_ticks
+
+    return {
+        'tick_length': np.full(total_time.shape, tick_length),
+        'tick_offset': np.full(total_time.shape, tick_offset),
+        'warp_start_tick': np.full(total_time.shape, warp_start_tick),
+        'warp_start_time': np.full(total_time.shape, warp_start_time),
+        'landing_tick': landing_tick,
+        'landing_time': tick_offset + landing_tick * tick_length,
+        'launch_tick': launch_tick,
+        'launch_time': tick_offset + launch_tick * tick_length,
+        'unsnapped_detonation_tick_delta': unsnapped_detonation_tick - landing_tick,
+    }
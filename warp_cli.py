@@ -0,0 +1,254 @@
+"""
+Headless batch solver: stream targets from CSV or JSONL through the
+vectorized solver and write one result per input row.
+
+    python warp_cli.py targets.csv -o results.csv
+    python warp_cli.py --input-format jsonl < targets.jsonl > results.jsonl
+    python warp_cli.py big.csv -o out.csv --workers 4 --chunk-size 50000
+    python warp_cli.py targets.csv --tick 1.0:0.25
+
+CSV input has a header naming any of distance, warp_speed, subwarp_speed,
+detonation_time and id; missing columns take the web app's defaults.
+Headerless CSV rows are read in that field order. JSONL lines are objects
+with the same keys or [distance, warp_speed, subwarp_speed,
+detonation_time] arrays. Output rows are numbered from 0 in input order,
+not counting the header or blank lines.
+
+Input is read and solved one chunk at a time and results are written as
+each chunk finishes, so memory stays bounded by the chunk size (times the
+number of workers) however long the input is. With --workers the chunks
+are solved in a process pool and written back in input order.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from warp_batch import BATCH_FIELDS, parse_batch_row, solve_batch, tick_align_batch
+
+DEFAULT_CHUNK_SIZE = 10000
+# Chunks queued per worker, so reading stays just ahead of solving
+CHUNKS_PER_WORKER = 2
+
+RESULT_FIELDS = ('total_time', 'peak_speed', 'accel_time', 'cruise_time', 'decel_time', 'accel_dist',
+                 'cruise_dist', 'decel_dist', 'launch_time', 'distance_remaining', 'current_speed')
+TICK_FIELDS = ('launch_tick', 'launch_time', 'landing_tick', 'landing_time', 'unsnapped_detonation_tick_delta')
+
+
+def output_fields(tick):
+    fields = ['row', 'id'] + list(RESULT_FIELDS)
+    if tick is not None:
+        fields += ['tick_' + field for field in TICK_FIELDS]
+    return fields + ['error']
+
+
+def parse_chunk(lines, input_format, header):
+    """
+    Parse raw input lines into solver rows
+
+    Returns:
+        (ids, valid_index, values, errors): id per line (or None), position
+        and 4-tuple of each valid line, and {position: message}
+    """
+    ids = [None] * len(lines)
+    valid_index = []
+    values = []
+    errors = {}
+    if input_format == 'csv':
+        records = csv.reader(lines)
+    else:
+        records = (line for line in lines)
+
+    for i, record in enumerate(records):
+        try:
+            if input_format == 'csv':
+                if header is None:
+                    row = record[:len(BATCH_FIELDS)]
+                else:
+                    row = {name: value for name, value in zip(header, record) if value != ''}
+                    ids[i] = row.get('id')
+            else:
+                row = json.loads(record)
+                if isinstance(row, dict):
+                    ids[i] = row.get('id')
+            values.append(parse_batch_row(row))
+            valid_index.append(i)
+        except (TypeError, ValueError) as e:
+            errors[i] = str(e)
+    return ids, valid_index, values, errors
+
+
+def solve_chunk(lines, first_row, input_format, output_format, header, tick):
+    """
+    Parse, solve and format one chunk of input lines
+
+    Returns:
+        Output text for the chunk
+    """
+    ids, valid_index, values, errors = parse_chunk(lines, input_format, header)
+
+    columns = {}
+    if values:
+        solver_input = [np.array(column) for column in zip(*values)]
+        solved = solve_batch(*solver_input)
+        columns = {field: solved[field].tolist() for field in RESULT_FIELDS}
+        if tick is not None:
+            ticks = tick_align_batch(solved['total_time'], solver_input[3], *tick)
+            columns.update(('tick_' + field, ticks[field].tolist()) for field in TICK_FIELDS)
+
+    # One value tuple per valid line, in the order of output_fields (less
+    # row, id and error), which holds even when no line in the chunk is valid
+    fields = output_fields(tick)[2:-1]
+    solved_rows = dict(zip(valid_index, zip(*(columns[field] for field in fields)))) if columns else {}
+
+    out = io.StringIO()
+    if output_format == 'csv':
+        writer = csv.writer(out, lineterminator='\n')
+        blank = ('',) * len(fields)
+        for i in range(len(lines)):
+            values = solved_rows.get(i)
+            if values is None:
+                writer.writerow((first_row + i, ids[i]) + blank + (errors[i],))
+            else:
+                writer.writerow((first_row + i, ids[i]) + values + ('',))
+    else:
+        for i in range(len(lines)):
+            record = {'row': first_row + i}
+            if ids[i] is not None:
+                record['id'] = ids[i]
+            values = solved_rows.get(i)
+            if values is None:
+                record['error'] = errors[i]
+            else:
+                record.update(zip(fields, values))
+            out.write(json.dumps(record))
+            out.write('\n')
+    return out.getvalue()
+
+
+def read_chunks(stream, chunk_size):
+    """
+    Non-empty input lines in lists of at most chunk_size
+    """
+    lines = (line for line in stream if line.strip())
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def read_header(stream, input_format):
+    """
+    Column names from a CSV header line, or None for headerless input
+
+    Returns:
+        (header, lines to put back in front of the stream)
+    """
+    if input_format != 'csv':
+        return None, []
+    for line in stream:
+        if line.strip():
+            break
+    else:
+        return None, []
+    names = [name.strip().lower() for name in next(csv.reader([line]))]
+    if any(name in BATCH_FIELDS or name == 'id' for name in names):
+        unknown = [name for name in names if name not in BATCH_FIELDS and name != 'id']
+        if unknown:
+            print(f'warning: ignoring columns {unknown}', file=sys.stderr)
+        return names, []
+    return None, [line]
+
+
+def run(stream, out, input_format='csv', output_format='csv', chunk_size=DEFAULT_CHUNK_SIZE,
+        workers=0, tick=None):
+    """
+    Solve every row of stream and write the results to out
+
+    Returns:
+        Number of rows read
+    """
+    header, pushed_back = read_header(stream, input_format)
+    chunks = read_chunks(itertools.chain(pushed_back, stream), chunk_size)
+    if output_format == 'csv':
+        out.write(','.join(output_fields(tick)) + '\n')
+
+    rows = 0
+    if workers <= 0:
+        for chunk in chunks:
+            out.write(solve_chunk(chunk, rows, input_format, output_format, header, tick))
+            rows += len(chunk)
+        return rows
+
+    # Keep a bounded window of chunks in flight and write them back in order
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+        first_row = 0
+        for chunk in chunks:
+            pending.append(pool.submit(solve_chunk, chunk, first_row, input_format, output_format, header, tick))
+            first_row += len(chunk)
+            if len(pending) >= workers * CHUNKS_PER_WORKER:
+                out.write(pending.popleft().result())
+        while pending:
+            out.write(pending.popleft().result())
+    return first_row
+
+
+def parse_tick_option(value):
+    """
+    --tick LENGTH[:OFFSET]
+    """
+    length, _, offset = value.partition(':')
+    tick = (float(length), float(offset or 0))
+    if tick[0] <= 0:
+        raise argparse.ArgumentTypeError('tick length must be greater than zero')
+    return tick
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', nargs='?', help='input file (default: stdin)')
+    parser.add_argument('-o', '--output', help='output file (default: stdout)')
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'),
+                        help='input format (default: from the file extension, else csv)')
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'),
+                        help='output format (default: from the output extension, else the input format)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='rows solved per chunk')
+    parser.add_argument('--workers', type=int, default=0, help='solver processes (default: solve in-process)')
+    parser.add_argument('--tick', type=parse_tick_option, metavar='LENGTH[:OFFSET]',
+                        help='add tick-aligned launch columns for this server tick grid')
+    args = parser.parse_args(argv)
+
+    def format_of(path):
+        if path and path.endswith(('.jsonl', '.ndjson')):
+            return 'jsonl'
+        if path and path.endswith('.csv'):
+            return 'csv'
+        return None
+
+    input_format = args.input_format or format_of(args.input) or 'csv'
+    output_format = args.output_format or format_of(args.output) or input_format
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+
+    stream = open(args.input, newline='') if args.input else sys.stdin
+    out = open(args.output, 'w', newline='') if args.output else sys.stdout
+    try:
+        rows = run(stream, out, input_format, output_format, args.chunk_size, args.workers, args.tick)
+    finally:
+        if args.input:
+            stream.close()
+        if args.output:
+            out.close()
+    print(f'{rows} rows', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,432 @@
+import math
+from collections import OrderedDict
+from threading import Lock
+
+# Constants
+AU_IN_M = 149597870700  # Astronomical Unit in meters
+
+# Ship parameters are rounded to these many decimals before caching
+WARP_SPEED_DECIMALS = 6  # AU/s
+SUBWARP_SPEED_DECIMALS = 3  # m/s
+PROFILE_CACHE_SIZE = 1024
+
+# EVE server simulation tick
+DEFAULT_TICK_LENGTH = 1.0  # seconds
+# Times this close past a tick boundary count as on it
+TICK_EPSILON = 1e-9
+
+
+def warp_dropout_speed(max_subwarp_speed):
+    """
+    Speed at which a ship drops out of warp, in m/s
+    """
+    return min(max_subwarp_speed / 2, 100)
+
+
+def short_warp_peak_speed(k_accel, k_decel, dropout_speed, warp_dist):
+    """
+    Top speed of a warp too short to reach max warp speed, in m/s
+
+    The ship accelerates to the peak and decelerates straight away, so the
+    accel distance (peak / k_accel - 1) and the decel distance
+    ((peak - dropout_speed) / k_decel) add up to the warp distance.
+    """
+    peak = (warp_dist + 1 + dropout_speed / k_decel) / (1 / k_accel + 1 / k_decel)
+    # Below these the phase times would go negative (sub-kilometer warps)
+    return max(peak, k_accel, dropout_speed)
+
+
+class ShipPhases:
+    """
+    The distance-independent part of a warp: acceleration and deceleration
+    phases, which only depend on the ship's warp and sub-warp speed.
+
+    Args:
+        max_warp_speed: Maximum warp speed in AU/s
+        max_subwarp_speed: Maximum sub-warp speed in m/s
+    """
+    __slots__ = (
+        'k_accel', 'k_decel', 'max_ms_warp_speed', 'warp_dropout_speed',
+        'accel_time', 'accel_dist', 'decel_time', 'decel_dist',
+    )
+
+    def __init__(self, max_warp_speed, max_subwarp_speed):
+        self.k_accel = max_warp_speed
+        self.k_decel = min(max_warp_speed / 3, 2)
+        self.warp_dropout_speed = warp_dropout_speed(max_subwarp_speed)
+        self.max_ms_warp_speed = max_warp_speed * AU_IN_M
+
+        # Acceleration phase: speed grows as k_accel * e^(k_accel * t) and
+        # position as e^(k_accel * t) - 1
+        self.accel_time = math.log(self.max_ms_warp_speed / self.k_accel) / self.k_accel
+        self.accel_dist = self.max_ms_warp_speed / self.k_accel - 1
+
+        # Deceleration phase: speed decays as max_ms_warp_speed * e^(-k_decel * t)
+        # until it reaches the dropout speed
+        self.decel_time = math.log(self.max_ms_warp_speed / self.warp_dropout_speed) / self.k_decel
+        self.decel_dist = (self.max_ms_warp_speed - self.warp_dropout_speed) / self.k_decel
+
+
+class ProfileCache:
+    """
+    Bounded LRU cache of ShipPhases keyed on quantized ship parameters.
+
+    Args:
+        maxsize: Maximum number of ship parameter combinations to keep
+    """
+
+    def __init__(self, maxsize=PROFILE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, max_warp_speed, max_subwarp_speed):
+        """
+        ShipPhases for the given speeds, computed on first use
+
+        Speeds that round to the same key share the phases of whichever was
+        seen first; speeds that round to zero are solved without the cache.
+        """
+        key = (round(max_warp_speed, WARP_SPEED_DECIMALS), round(max_subwarp_speed, SUBWARP_SPEED_DECIMALS))
+        if not (key[0] and key[1]):
+            # Below the quantum different speeds would share one entry
+            return ShipPhases(max_warp_speed, max_subwarp_speed)
+        with self._lock:
+            phases = self._entries.get(key)
+            if phases is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return phases
+            self.misses += 1
+
+        # Compute outside the lock; a concurrent miss on the same key just
+        # stores an equivalent value
+        phases = ShipPhases(max_warp_speed, max_subwarp_speed)
+        with self._lock:
+            self._entries[key] = phases
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return phases
+
+    def clear(self):
+        """
+        Drop all entries and reset the counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Hit/miss counters and current size
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._entries), 'maxsize': self.maxsize}
+
+
+PROFILE_CACHE = ProfileCache()
+
+
+class WarpProfile:
+    """
+    Warp timing for one ship and distance in EVE Online.
+
+    All per-profile constants are computed once in the constructor, so the
+    position/speed/remaining queries are O(1). The distance-independent
+    phases are shared through a ProfileCache, leaving only the cruise phase
+    to compute per distance. Warps too short to reach max speed get their
+    own lower peak speed and no cruise phase.
+
+    Args:
+        max_warp_speed: Maximum warp speed in AU/s
+        max_subwarp_speed: Maximum sub-warp speed in m/s
+        warp_dist: Warp distance in meters
+        cache: ProfileCache to use, or None to compute the phases directly
+    """
+    __slots__ = (
+        'warp_speed', 'subwarp_speed', 'warp_dist',
+        'k_accel', 'k_decel', 'max_ms_warp_speed', 'warp_dropout_speed', 'peak_speed',
+        'accel_time', 'accel_dist', 'cruise_time', 'cruise_dist',
+        'decel_time', 'decel_dist', 'total_time', 'travel_dist',
+        'cruise_end', 'decel_start_dist',
+    )
+
+    def __init__(self, max_warp_speed, max_subwarp_speed, warp_dist, cache=PROFILE_CACHE):
+        self.warp_speed = max_warp_speed
+        self.subwarp_speed = max_subwarp_speed
+        self.warp_dist = warp_dist
+
+        # Acceleration and deceleration phases come from the ship cache
+        if cache is not None:
+            phases = cache.get(max_warp_speed, max_subwarp_speed)
+        else:
+            phases = ShipPhases(max_warp_speed, max_subwarp_speed)
+        self.k_accel = phases.k_accel
+        self.k_decel = phases.k_decel
+        self.warp_dropout_speed = phases.warp_dropout_speed
+        self.max_ms_warp_speed = phases.max_ms_warp_speed
+        self.accel_time = phases.accel_time
+        self.accel_dist = phases.accel_dist
+        self.decel_time = phases.decel_time
+        self.decel_dist = phases.decel_dist
+        self.peak_speed = self.max_ms_warp_speed
+
+        if warp_dist >= self.accel_dist + self.decel_dist:
+            # Cruise phase covers whatever distance is left at max speed
+            self.cruise_dist = warp_dist - (self.accel_dist + self.decel_dist)
+            self.cruise_time = self.cruise_dist / self.max_ms_warp_speed
+        else:
+            # Short warp: accel and decel meet below max speed, no cruise
+            self.peak_speed = short_warp_peak_speed(self.k_accel, self.k_decel, self.warp_dropout_speed, warp_dist)
+            self.accel_time = math.log(self.peak_speed / self.k_accel) / self.k_accel
+            self.accel_dist = self.peak_speed / self.k_accel - 1
+            self.decel_time = math.log(self.peak_speed / self.warp_dropout_speed) / self.k_decel
+            self.decel_dist = (self.peak_speed - self.warp_dropout_speed) / self.k_decel
+            self.cruise_dist = 0
+            self.cruise_time = 0
+
+        # Phase boundaries
+        self.cruise_end = self.accel_time + self.cruise_time
+        self.total_time = self.cruise_end + self.decel_time
+        self.decel_start_dist = self.accel_dist + self.cruise_dist
+        self.travel_dist = self.decel_start_dist + self.decel_dist
+
+    def __repr__(self):
+        return (f"WarpProfile(warp_speed={self.warp_speed!r}, subwarp_speed={self.subwarp_speed!r}, "
+                f"warp_dist={self.warp_dist!r}, total_time={self.total_time:.3f})")
+
+    def position(self, t):
+        """
+        Distance travelled t seconds after warp start, in meters
+        """
+        if t <= 0:
+            return 0.0
+        if t <= self.accel_time:
+            return math.exp(self.k_accel * t) - 1
+        if t <= self.cruise_end:
+            return self.accel_dist + self.peak_speed * (t - self.accel_time)
+        if t < self.total_time:
+            time_in_decel = t - self.cruise_end
+            return self.decel_start_dist - (self.peak_speed / self.k_decel) * math.expm1(-self.k_decel * time_in_decel)
+        return self.travel_dist
+
+    def speed(self, t):
+        """
+        Speed t seconds after warp start, in m/s
+        """
+        if t <= self.accel_time:
+            return self.k_accel * math.exp(self.k_accel * max(t, 0))
+        if t <= self.cruise_end:
+            return self.peak_speed
+        time_in_decel = min(t, self.total_time) - self.cruise_end
+        return self.peak_speed * math.exp(-self.k_decel * time_in_decel)
+
+    def remaining(self, t):
+        """
+        Distance still to travel t seconds after warp start, in meters
+
+        Evaluated per phase in closed form, so late in the warp it doesn't
+        lose precision to subtracting two nearly equal distances.
+        """
+        if t >= self.total_time:
+            return 0.0
+        if t > self.cruise_end:
+            # Decel distance left is (speed - dropout speed) / k_decel
+            time_left = self.total_time - t
+            return self.warp_dropout_speed * math.expm1(self.k_decel * time_left) / self.k_decel
+        if t > self.accel_time:
+            return self.decel_dist + self.peak_speed * (self.cruise_end - t)
+        return self.travel_dist - self.position(t)
+
+    def distance_covered_in(self, time_left):
+        """
+        Distance covered in the last time_left seconds of the warp, as used
+        for the bomb launch distance
+
+        The window may span any of the phases; a window longer than the
+        whole warp covers the whole warp.
+
+        Args:
+            time_left: Time remaining in seconds
+
+        Returns:
+            Distance in meters
+        """
+        if time_left <= 0:
+            return 0
+        return self.remaining(self.total_time - time_left)
+
+    def launch(self, detonation_time):
+        """
+        Bomb launch timing for a bomb with the given detonation time
+        """
+        return LaunchTiming(self, detonation_time)
+
+    def tick_launch(self, detonation_time, tick_length=DEFAULT_TICK_LENGTH, tick_offset=0.0):
+        """
+        Bomb launch timing snapped to the server tick grid
+        """
+        return TickTiming(self, detonation_time, tick_length, tick_offset)
+
+    def as_tuple(self):
+        """
+        The legacy calculate_time_in_warp result tuple
+        """
+        return (self.total_time, self.accel_time, self.cruise_time, self.decel_time,
+                self.accel_dist, self.cruise_dist, self.decel_dist,
+                self.k_accel, self.k_decel, self.max_ms_warp_speed)
+
+
+class LaunchTiming:
+    """
+    When to launch a bomb so it detonates as the target lands.
+
+    Args:
+        profile: WarpProfile of the target
+        detonation_time: Bomb detonation time in seconds
+    """
+    __slots__ = ('profile', 'detonation_time', 'launch_time', 'distance_remaining', 'current_speed')
+
+    def __init__(self, profile, detonation_time):
+        self.profile = profile
+        self.detonation_time = detonation_time
+        # Launch when the remaining flight time equals the detonation time
+        self.launch_time = profile.total_time - detonation_time
+        self.distance_remaining = profile.remaining(self.launch_time)
+        self.current_speed = profile.speed(self.launch_time)
+
+
+def next_tick(t, tick_length=DEFAULT_TICK_LENGTH, tick_offset=0.0):
+    """
+    Index of the first tick boundary at or after t
+
+    Tick k falls at tick_offset + k * tick_length seconds.
+    """
+    return math.ceil((t - tick_offset) / tick_length - TICK_EPSILON)
+
+
+class TickTiming:
+    """
+    Launch timing quantized to the server tick.
+
+    Times are in seconds after the target's warp command, with tick
+    boundaries at tick_offset + k * tick_length. The server starts the
+    warp, executes the launch and resolves detonation and landing on tick
+    boundaries, so the bomb hits when it detonates on the landing tick.
+
+    Args:
+        profile: WarpProfile of the target
+        detonation_time: Bomb detonation time in seconds
+        tick_length: Server tick length in seconds
+        tick_offset: Time of a tick boundary relative to the warp command
+    """
+    __slots__ = (
+        'tick_length', 'tick_offset', 'detonation_ticks',
+        'warp_start_tick', 'landing_tick', 'launch_tick', 'unsnapped_detonation_tick',
+    )
+
+    def __init__(self, profile, detonation_time, tick_length=DEFAULT_TICK_LENGTH, tick_offset=0.0):
+        if tick_length <= 0:
+            raise ValueError('Tick length must be greater than zero.')
+        self.tick_length = tick_length
+        self.tick_offset = tick_offset % tick_length
+
+        # Warp starts on the first tick after the command; landing is
+        # resolved on the first tick after the warp ends
+        self.warp_start_tick = next_tick(0.0, tick_length, self.tick_offset)
+        self.landing_tick = next_tick(self.tick_time(self.warp_start_tick) + profile.total_time,
+                                      tick_length, self.tick_offset)
+
+        # A launch executes on a tick, so detonation is a whole number of
+        # ticks later; the snapped launch detonates on the landing tick
+        self.detonation_ticks = math.ceil(detonation_time / tick_length - TICK_EPSILON)
+        self.launch_tick = self.landing_tick - self.detonation_ticks
+
+        # Where the tick-blind launch time, measured from the same warp
+        # start as landing, would have put the detonation
+        unsnapped_launch = next_tick(self.warp_start_time + profile.total_time - detonation_time,
+                                     tick_length, self.tick_offset)
+        self.unsnapped_detonation_tick = unsnapped_launch + self.detonation_ticks
+
+    def tick_time(self, tick):
+        """
+        Time of a tick boundary in seconds after the warp command
+        """
+        return self.tick_offset + tick * self.tick_length
+
+    @property
+    def warp_start_time(self):
+        return self.tick_time(self.warp_start_tick)
+
+    @property
+    def landing_time(self):
+        return self.tick_time(self.landing_tick)
+
+    @property
+    def launch_time(self):
+        return self.tick_time(self.launch_tick)
+
+    @property
+    def unsnapped_detonation_tick_delta(self):
+        """
+        Ticks between landing and the detonation of a tick-blind launch;
+        0 hits the landing tick, negative detonates before the target lands
+        """
+        return self.unsnapped_detonation_tick - self.landing_tick
+
+    def as_dict(self):
+        return {
+            'tick_length': self.tick_length,
+            'tick_offset': self.tick_offset,
+            'warp_start_tick': self.warp_start_tick,
+            'warp_start_time': self.warp_start_time,
+            'landing_tick': self.landing_tick,
+            'landing_time': self.landing_time,
+            'launch_tick': self.launch_tick,
+            'launch_time': self.launch_time,
+            'unsnapped_detonation_tick_delta': self.unsnapped_detonation_tick_delta,
+        }
+
+
+def solve(distance_au, warp_speed, subwarp_speed, detonation_time):
+    """
+    Build the warp profile and launch timing for one target
+
+    Args:
+        distance_au: Warp distance in AU
+        warp_speed: Warp speed in AU/s
+        subwarp_speed: Sub-warp speed in m/s
+        detonation_time: Bomb detonation time in seconds
+
+    Returns:
+        LaunchTiming; the profile is available as .profile
+    """
+    return WarpProfile(warp_speed, subwarp_speed, distance_au * AU_IN_M).launch(detonation_time)
+
+
+def calculate_time_in_warp(max_warp_speed, max_subwarp_speed, warp_dist):
+    """
+    Calculate the time and distance parameters for a warp in EVE Online.
+
+    Kept for callers of the old tuple API; new code should use WarpProfile.
+    """
+    return WarpProfile(max_warp_speed, max_subwarp_speed, warp_dist).as_tuple()
+
+
+def calculate_distance_remaining(time_left, k_decel, max_ms_warp_speed, warp_dropout_speed, decel_dist):
+    """
+    Calculate how much distance will be covered in the last time_left
+    seconds of deceleration
+
+    Kept for callers of the old API; it can't see the cruise phase, so
+    windows longer than deceleration return decel_dist. New code should
+    use WarpProfile.distance_covered_in.
+    """
+    if time_left <= 0:
+        return 0
+    return min(warp_dropout_speed * math.expm1(k_decel * time_left) / k_decel, decel_dist)
@@ -0,0 +1,182 @@
+"""
+Inverse warp solver: which distances or warp speeds give a usable launch
+window for a bomb with a given detonation time.
+
+Every constraint reduces to a window on total warp time. Total warp time
+grows monotonically with distance and inverts in closed form, through the
+cruise phase for long warps and through the peak speed for short ones.
+Total warp time against warp speed is not guaranteed to be monotonic, so
+warp speed windows are bracketed on a coarse log grid and refined by
+bisection.
+"""
+import math
+
+from warp_engine import AU_IN_M, TICK_EPSILON, ShipPhases, WarpProfile
+
+# Default search ranges
+DISTANCE_RANGE = (0.0001, 1000.0)  # AU
+WARP_SPEED_RANGE = (0.5, 32.0)  # AU/s
+# Coarse grid used to bracket warp speed roots
+BRACKET_POINTS = 48
+BISECT_ITERATIONS = 60
+
+
+def total_time_window(detonation_time, min_launch_time=0.0, max_launch_time=math.inf, tick=None):
+    """
+    Range of total warp times that give an acceptable launch
+
+    Args:
+        detonation_time: Bomb detonation time in seconds
+        min_launch_time: Earliest acceptable launch, in seconds after warp start
+        max_launch_time: Latest acceptable launch, in seconds after warp start
+        tick: Optional (tick_length, tick_offset); the launch is then
+            the tick-aligned one from warp_engine.TickTiming and the
+            limits count from the warp start tick
+
+    Returns:
+        (lowest, highest) total warp time in seconds; empty if lowest > highest
+    """
+    if tick is None:
+        return detonation_time + min_launch_time, detonation_time + max_launch_time
+
+    # Launch tick = warp start tick + ceil(total / T) - detonation ticks,
+    # so each launch limit becomes a whole-tick limit on total time
+    tick_length = tick[0]
+    if tick_length <= 0:
+        raise ValueError('Tick length must be greater than zero.')
+    detonation_ticks = math.ceil(detonation_time / tick_length - TICK_EPSILON)
+    min_ticks = math.ceil(min_launch_time / tick_length - TICK_EPSILON)
+    lowest = (min_ticks + detonation_ticks - 1 + 2 * TICK_EPSILON) * tick_length
+    if math.isinf(max_launch_time):
+        return lowest, math.inf
+    max_ticks = math.floor(max_launch_time / tick_length + TICK_EPSILON)
+    return lowest, (max_ticks + detonation_ticks) * tick_length
+
+
+def distance_window(warp_speed, subwarp_speed, detonation_time, min_launch_time=0.0,
+                    max_launch_time=math.inf, tick=None, distance_range=DISTANCE_RANGE):
+    """
+    Warp distances for one ship that give an acceptable launch
+
+    Args:
+        warp_speed: Warp speed in AU/s
+        subwarp_speed: Sub-warp speed in m/s
+        detonation_time: Bomb detonation time in seconds
+        min_launch_time: Earliest acceptable launch, in seconds after warp start
+        max_launch_time: Latest acceptable launch, in seconds after warp start
+        tick: Optional (tick_length, tick_offset)
+        distance_range: (lowest, highest) distance to consider, in AU
+
+    Returns:
+        List of (lowest, highest) distance intervals in AU; empty if none
+    """
+    low_time, high_time = total_time_window(detonation_time, min_launch_time, max_launch_time, tick)
+    low_d, high_d = distance_range
+
+    def total_time(distance_au):
+        return WarpProfile(warp_speed, subwarp_speed, distance_au * AU_IN_M).total_time
+
+    if low_time > high_time or total_time(low_d) > high_time or total_time(high_d) < low_time:
+        return []
+    lowest = low_d if total_time(low_d) >= low_time else _distance_for_time(warp_speed, subwarp_speed, low_time, low_d, high_d)
+    highest = high_d if total_time(high_d) <= high_time else _distance_for_time(warp_speed, subwarp_speed, high_time, low_d, high_d)
+    return [(lowest, highest)] if lowest <= highest else []
+
+
+def _distance_for_time(warp_speed, subwarp_speed, target_time, low_d, high_d):
+    """
+    Distance in AU whose total warp time equals target_time
+    """
+    phases = ShipPhases(warp_speed, subwarp_speed)
+    min_dist = phases.accel_dist + phases.decel_dist
+    base_time = phases.accel_time + phases.decel_time
+    k_accel, k_decel = phases.k_accel, phases.k_decel
+    dropout_speed = phases.warp_dropout_speed
+
+    if target_time >= base_time:
+        # Cruise phase: total time is linear in distance
+        distance = min_dist + (target_time - base_time) * phases.max_ms_warp_speed
+    else:
+        # Short warp: total time is ln(peak / k_accel) / k_accel + ln(peak / dropout) / k_decel,
+        # solved for the peak, whose distance is closed form too
+        rate = 1 / k_accel + 1 / k_decel
+        peak = math.exp((target_time + math.log(k_accel) / k_accel + math.log(dropout_speed) / k_decel) / rate)
+        distance = peak * rate - 1 - dropout_speed / k_decel
+    return min(max(distance / AU_IN_M, low_d), high_d)
+
+
+def warp_speed_window(distance_au, subwarp_speed, detonation_time, min_launch_time=0.0,
+                      max_launch_time=math.inf, tick=None, speed_range=WARP_SPEED_RANGE):
+    """
+    Target warp speeds over one distance that give an acceptable launch
+
+    Args:
+        distance_au: Warp distance in AU
+        subwarp_speed: Sub-warp speed in m/s
+        detonation_time: Bomb detonation time in seconds
+        min_launch_time: Earliest acceptable launch, in seconds after warp start
+        max_launch_time: Latest acceptable launch, in seconds after warp start
+        tick: Optional (tick_length, tick_offset)
+        speed_range: (lowest, highest) warp speed to consider, in AU/s
+
+    Returns:
+        List of (lowest, highest) warp speed intervals in AU/s; empty if none
+    """
+    low_time, high_time = total_time_window(detonation_time, min_launch_time, max_launch_time, tick)
+    if low_time > high_time:
+        return []
+    warp_dist = distance_au * AU_IN_M
+
+    def total_time(warp_speed):
+        # Bypass the ship cache so a sweep doesn't evict real ships
+        return WarpProfile(warp_speed, subwarp_speed, warp_dist, cache=None).total_time
+
+    def inside(warp_speed):
+        return low_time <= total_time(warp_speed) <= high_time
+
+    # Bracket crossings of both window edges on a coarse log grid
+    low_w, high_w = speed_range
+    step = math.log(high_w / low_w) / (BRACKET_POINTS - 1)
+    grid = [low_w * math.exp(step * i) for i in range(BRACKET_POINTS)]
+    grid[-1] = high_w
+    times = [total_time(w) for w in grid]
+    edges = [low_w, high_w]
+    for level in (low_time, high_time):
+        if math.isinf(level):
+            continue
+        for w0, w1, t0, t1 in zip(grid, grid[1:], times, times[1:]):
+            if (t0 - level) * (t1 - level) < 0:
+                edges.append(_bisect(lambda w: total_time(w) - level, w0, w1))
+    edges.sort()
+
+    # Keep the pieces between crossings that sit inside the window
+    intervals = []
+    for w0, w1 in zip(edges, edges[1:]):
+        if w1 <= w0 or not inside(0.5 * (w0 + w1)):
+            continue
+        if intervals and math.isclose(intervals[-1][1], w0):
+            intervals[-1] = (intervals[-1][0], w1)
+        else:
+            intervals.append((w0, w1))
+    return intervals
+
+
+def _bisect(f, low, high):
+    """
+    Root of f in [low, high], assuming f changes sign over the bracket
+    """
+    f_low = f(low)
+    if f_low == 0:
+        return low
+    for _ in range(BISECT_ITERATIONS):
+        mid = 0.5 * (low + high)
+        f_mid = f(mid)
+        if f_mid == 0:
+            return mid
+        if (f_mid < 0) == (f_low < 0):
+            low, f_low = mid, f_mid
+        else:
+            high = mid
+        if high - low <= 1e-12 * high:
+            break
+    return 0.5 * (low + high)
@@ -0,0 +1,51 @@
+from warp_engine import AU_IN_M
+
+
+def report_sections(distance_au, warp_speed, subwarp_speed, detonation_time, profile, timing):
+    """
+    Plain-text solution for one target, as shown by the desktop app
+
+    Returns:
+        List of (section title, list of lines)
+    """
+    distance_m = profile.warp_dist
+    remaining = timing.distance_remaining
+    current_speed = timing.current_speed
+    return [
+        ("TARGET INFORMATION", [
+            f"Warp Distance: {distance_au:.2f} AU ({distance_m/1000:,.0f} km)",
+            f"Warp Speed: {warp_speed} AU/s",
+            f"Sub Warp Speed: {subwarp_speed} m/s",
+            f"Bomb Detonation Time: {detonation_time} seconds"
+        ]),
+        ("WARP TIME BREAKDOWN", [
+            f"Acceleration Phase: {profile.accel_time:.2f} seconds (distance: {profile.accel_dist/1000:,.0f} km)",
+            f"Cruise Phase: {profile.cruise_time:.2f} seconds (distance: {profile.cruise_dist/1000:,.0f} km)",
+            f"Deceleration Phase: {profile.decel_time:.2f} seconds (distance: {profile.decel_dist/1000:,.0f} km)",
+            f"\nTotal Warp Time: {profile.total_time:.2f} seconds"
+        ]),
+        ("BOMB LAUNCH TIMING", [
+            f"Launch Bomb at: {timing.launch_time:.2f} seconds after warp start",
+            f"Which is {detonation_time:.2f} seconds before landing",
+            f"\nAt launch time:",
+            f"- Distance remaining: {remaining / AU_IN_M:.4f} AU ({remaining/1000:,.0f} km)",
+            f"- Current speed: {current_speed:,.0f} m/s ({current_speed/AU_IN_M:.2f} AU/s)",
+            f"- This distance will be covered in exactly {detonation_time:.2f} seconds"
+        ]),
+    ]
+
+
+def format_report(sections):
+    """
+    Sections from report_sections as one block of text
+    """
+    lines = []
+    for title, items in sections:
+        lines.append(title)
+        for item in items:
+            # A leading newline sets the line off with a blank line
+            if item.startswith("\n"):
+                lines.append("")
+            lines.append(f"  {item.lstrip()}")
+        lines.append("")
+    return "\n".join(lines)
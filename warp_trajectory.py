@@ -0,0 +1,159 @@
+import numpy as np
+
+# Default number of samples for a fixed-resolution trajectory
+DEFAULT_TRAJECTORY_POINTS = 200
+# Upper bound on samples in one trajectory
+MAX_TRAJECTORY_POINTS = 100000
+# Default adaptive tolerance, as a fraction of the warp distance / top speed
+DEFAULT_TOLERANCE = 1e-3
+# Samples per phase before adaptive refinement starts
+ADAPTIVE_SEED_POINTS = 8
+# Upper bound on adaptive refinement passes (each can double the samples)
+MAX_REFINE_PASSES = 24
+
+
+def trajectory(profile, t):
+    """
+    Vectorized WarpProfile.position and WarpProfile.speed over many times.
+
+    Mirrors warp_engine.WarpProfile; keep the two in step.
+
+    Args:
+        profile: WarpProfile of the target
+        t: Array of times in seconds after warp start
+
+    Returns:
+        (position, speed) arrays in meters and m/s
+    """
+    t = np.asarray(t, dtype=np.float64)
+    k_accel = profile.k_accel
+    k_decel = profile.k_decel
+    peak = profile.peak_speed
+
+    in_accel = t <= profile.accel_time
+    in_cruise = ~in_accel & (t <= profile.cruise_end)
+    t_accel = np.clip(t, 0, profile.accel_time)
+    t_decel = np.clip(t, profile.cruise_end, profile.total_time) - profile.cruise_end
+
+    position = np.select(
+        [t <= 0, in_accel, in_cruise, t < profile.total_time],
+        [0.0,
+         np.expm1(k_accel * t_accel),
+         profile.accel_dist + peak * (t - profile.accel_time),
+         profile.decel_start_dist - (peak / k_decel) * np.expm1(-k_decel * t_decel)],
+        profile.travel_dist)
+    speed = np.select(
+        [in_accel, in_cruise],
+        [k_accel * np.exp(k_accel * t_accel), peak],
+        peak * np.exp(-k_decel * t_decel))
+    return position, speed
+
+
+def remaining_distance(profile, t, position):
+    """
+    Vectorized WarpProfile.remaining, given the positions at t from
+    trajectory()
+    """
+    t = np.asarray(t, dtype=np.float64)
+    time_left = np.clip(profile.total_time - t, 0, None)
+    return np.select(
+        [t > profile.cruise_end, t > profile.accel_time],
+        [profile.warp_dropout_speed * np.expm1(profile.k_decel * time_left) / profile.k_decel,
+         profile.decel_dist + profile.peak_speed * (profile.cruise_end - t)],
+        profile.travel_dist - position)
+
+
+def phase_boundaries(profile):
+    """
+    Start and end time of each non-empty phase
+
+    Returns:
+        List of (phase name, start, end)
+    """
+    phases = [
+        ('accel', 0.0, profile.accel_time),
+        ('cruise', profile.accel_time, profile.cruise_end),
+        ('decel', profile.cruise_end, profile.total_time),
+    ]
+    return [(name, start, end) for name, start, end in phases if end > start]
+
+
+def _with_boundaries(profile, t):
+    edges = [edge for _, start, end in phase_boundaries(profile) for edge in (start, end)]
+    return np.unique(np.concatenate([t, edges]))
+
+
+def uniform_times(profile, points=DEFAULT_TRAJECTORY_POINTS):
+    """
+    Evenly spaced sample times over the whole warp, plus the phase
+    boundaries so the curve's corners are exact
+    """
+    return _with_boundaries(profile, np.linspace(0.0, profile.total_time, max(2, points)))
+
+
+def adaptive_times(profile, tolerance=DEFAULT_TOLERANCE, max_points=MAX_TRAJECTORY_POINTS):
+    """
+    Sample times that put more points where the curve bends.
+
+    Starting from a few samples per phase, every interval whose midpoint is
+    further than tolerance from the straight line between its ends (in
+    position or speed) is split, one vectorized pass at a time, until the
+    whole curve is within tolerance or max_points is reached.
+
+    Args:
+        profile: WarpProfile of the target
+        tolerance: Allowed chord error as a fraction of the warp distance
+            (position) and of top speed (speed)
+        max_points: Upper bound on the number of samples
+
+    Returns:
+        Sorted array of sample times
+    """
+    seeds = [np.linspace(start, end, ADAPTIVE_SEED_POINTS + 1) for _, start, end in phase_boundaries(profile)]
+    t = np.unique(np.concatenate(seeds)) if seeds else np.array([0.0])
+    position, speed = trajectory(profile, t)
+    position_scale = max(profile.travel_dist, 1.0) * tolerance
+    speed_scale = max(profile.peak_speed, 1.0) * tolerance
+
+    for _ in range(MAX_REFINE_PASSES):
+        budget = max_points - len(t)
+        if budget <= 0 or len(t) < 2:
+            break
+        middle = (t[:-1] + t[1:]) / 2
+        middle_position, middle_speed = trajectory(profile, middle)
+        error = np.maximum(
+            np.abs(middle_position - (position[:-1] + position[1:]) / 2) / position_scale,
+            np.abs(middle_speed - (speed[:-1] + speed[1:]) / 2) / speed_scale)
+        split = np.flatnonzero(error > 1)
+        if len(split) == 0:
+            break
+        if len(split) > budget:
+            # Spend what's left of the budget on the worst intervals
+            split = np.sort(split[np.argsort(error[split])[-budget:]])
+
+        # Merge the new midpoints in; both sides are already sorted
+        t = np.insert(t, split + 1, middle[split])
+        position = np.insert(position, split + 1, middle_position[split])
+        speed = np.insert(speed, split + 1, middle_speed[split])
+    return t
+
+
+def sample_trajectory(profile, points=DEFAULT_TRAJECTORY_POINTS, adaptive=False,
+                      tolerance=DEFAULT_TOLERANCE, max_points=MAX_TRAJECTORY_POINTS):
+    """
+    Time series of the target's position, remaining distance and speed
+
+    Returns:
+        Dict of equal-length arrays: time, position, remaining, speed
+    """
+    if adaptive:
+        t = adaptive_times(profile, tolerance, max_points)
+    else:
+        t = uniform_times(profile, min(points, max_points))
+    position, speed = trajectory(profile, t)
+    return {
+        'time': t,
+        'position': position,
+        'remaining': remaining_distance(profile, t, position),
+        'speed': speed,
+    }
@@ -0,0 +1,192 @@
+"""
+Launch-window confidence from uncertain inputs.
+
+Distances from d-scan and guessed warp speed skills are estimates, so each
+input can be given as a distribution instead of a number:
+
+    5                                  exact value
+    {'value': 5, 'sd': 0.2}            normal
+    {'value': 5, 'tolerance': 0.5}     uniform over value +/- tolerance
+    {'min': 4, 'max': 6}               uniform
+    {'min': 4, 'mode': 5, 'max': 6}    triangular
+
+Monte Carlo samples of every input are solved in one vectorized pass, and
+central-difference sensitivities of total warp time at the nominal inputs
+give a linearized spread to compare against.
+"""
+import math
+
+import numpy as np
+
+from warp_batch import calculate_time_in_warp_batch, tick_align_batch
+from warp_engine import AU_IN_M, WarpProfile
+
+DEFAULT_SAMPLES = 5000
+MAX_SAMPLES = 100000
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+# Relative step for the sensitivity derivatives
+SENSITIVITY_STEP = 1e-6
+# Samples are clipped to at least this fraction of their nominal value so
+# wide normals can't produce zero or negative inputs
+MIN_SAMPLE_FRACTION = 1e-3
+
+INPUTS = ('distance', 'warp_speed', 'subwarp_speed', 'detonation_time')
+
+
+class InputDistribution:
+    """
+    One uncertain input parsed from a number or a distribution object
+
+    Args:
+        name: Input name, used in error messages
+        spec: Number or dict (see the module docstring)
+    """
+    __slots__ = ('name', 'kind', 'nominal', 'params')
+
+    def __init__(self, name, spec):
+        self.name = name
+        if isinstance(spec, dict):
+            if 'sd' in spec:
+                self.kind = 'normal'
+                self.nominal = float(spec['value'])
+                self.params = (self.nominal, float(spec['sd']))
+            elif 'tolerance' in spec:
+                self.kind = 'uniform'
+                self.nominal = float(spec['value'])
+                tolerance = float(spec['tolerance'])
+                self.params = (self.nominal - tolerance, self.nominal + tolerance)
+            elif 'mode' in spec:
+                self.kind = 'triangular'
+                self.params = (float(spec['min']), float(spec['mode']), float(spec['max']))
+                self.nominal = self.params[1]
+            elif 'min' in spec and 'max' in spec:
+                self.kind = 'uniform'
+                self.params = (float(spec['min']), float(spec['max']))
+                self.nominal = sum(self.params) / 2
+            else:
+                raise ValueError(f"'{name}' needs 'sd', 'tolerance', or 'min' and 'max'.")
+        else:
+            self.kind = 'exact'
+            self.nominal = float(spec)
+            self.params = ()
+
+        if not (math.isfinite(self.nominal) and self.nominal > 0):
+            raise ValueError(f"'{name}' must be greater than zero.")
+        if not all(math.isfinite(param) for param in self.params):
+            raise ValueError(f"'{name}' has a non-numeric parameter.")
+        if self.kind == 'normal' and self.params[1] < 0:
+            raise ValueError(f"'{name}' standard deviation can't be negative.")
+        if self.kind in ('uniform', 'triangular') and not self.params[0] <= self.nominal <= self.params[-1]:
+            raise ValueError(f"'{name}' range must have min <= max.")
+
+    def sample(self, rng, n):
+        """
+        n samples as a float64 array
+        """
+        if self.kind == 'normal':
+            values = rng.normal(*self.params, n)
+        elif self.kind == 'uniform':
+            values = rng.uniform(*self.params, n)
+        elif self.kind == 'triangular' and self.params[0] < self.params[2]:
+            values = rng.triangular(*self.params, n)
+        else:
+            return np.full(n, self.nominal)
+        return np.maximum(values, self.nominal * MIN_SAMPLE_FRACTION)
+
+    def sd(self):
+        """
+        Standard deviation of the distribution (before clipping)
+        """
+        if self.kind == 'normal':
+            return self.params[1]
+        if self.kind == 'uniform':
+            return (self.params[1] - self.params[0]) / math.sqrt(12)
+        if self.kind == 'triangular':
+            a, c, b = self.params
+            return math.sqrt((a * a + b * b + c * c - a * b - a * c - b * c) / 18)
+        return 0.0
+
+
+def summarize(values, percentiles):
+    """
+    Mean, standard deviation and percentiles of a sample array
+    """
+    points = np.percentile(values, percentiles)
+    return {
+        'mean': float(values.mean()),
+        'sd': float(values.std()),
+        'percentiles': {str(p): float(v) for p, v in zip(percentiles, points)},
+    }
+
+
+def sensitivity(distance_au, warp_speed, subwarp_speed):
+    """
+    Partial derivatives of total warp time at one point, by central
+    differences on the exact solver
+
+    Returns:
+        Dict of seconds per unit (AU, AU/s, m/s) for each ship input
+    """
+    def total_time(d, w, s):
+        return WarpProfile(w, s, d * AU_IN_M, cache=None).total_time
+
+    point = {'distance': distance_au, 'warp_speed': warp_speed, 'subwarp_speed': subwarp_speed}
+    derivatives = {}
+    for name, value in point.items():
+        step = value * SENSITIVITY_STEP
+        up = dict(point, **{name: value + step})
+        down = dict(point, **{name: value - step})
+        derivatives[name] = (total_time(up['distance'], up['warp_speed'], up['subwarp_speed'])
+                             - total_time(down['distance'], down['warp_speed'], down['subwarp_speed'])) / (2 * step)
+    return derivatives
+
+
+def launch_uncertainty(inputs, samples=DEFAULT_SAMPLES, percentiles=DEFAULT_PERCENTILES, tick=None, seed=None):
+    """
+    Launch-window distribution for uncertain target and bomb inputs
+
+    Args:
+        inputs: Dict of InputDistribution for distance (AU), warp_speed
+            (AU/s), subwarp_speed (m/s) and detonation_time (s)
+        samples: Number of Monte Carlo samples
+        percentiles: Percentiles to report, 0-100
+        tick: Optional (tick_length, tick_offset); adds the probability of
+            each tick-aligned launch time
+        seed: Optional random seed for reproducible results
+
+    Returns:
+        Dict with nominal values, total/launch time summaries, the launch
+        window between the outer percentiles, sensitivities and the
+        linearized total time spread
+    """
+    rng = np.random.default_rng(seed)
+    distance, warp_speed, subwarp_speed, detonation_time = (inputs[name].sample(rng, samples) for name in INPUTS)
+
+    total_time = calculate_time_in_warp_batch(warp_speed, subwarp_speed, distance * AU_IN_M)['total_time']
+    launch_time = total_time - detonation_time
+
+    nominal = {name: inputs[name].nominal for name in INPUTS}
+    nominal_total = WarpProfile(nominal['warp_speed'], nominal['subwarp_speed'],
+                                nominal['distance'] * AU_IN_M).total_time
+    derivatives = sensitivity(nominal['distance'], nominal['warp_speed'], nominal['subwarp_speed'])
+    linear_sd = math.sqrt(sum((derivatives[name] * inputs[name].sd()) ** 2 for name in derivatives))
+
+    launch = summarize(launch_time, percentiles)
+    result = {
+        'samples': samples,
+        'nominal': dict(nominal, total_time=nominal_total, launch_time=nominal_total - nominal['detonation_time']),
+        'total_time': summarize(total_time, percentiles),
+        'launch_time': launch,
+        'window': [launch['percentiles'][str(percentiles[0])], launch['percentiles'][str(percentiles[-1])]],
+        'sensitivity': derivatives,
+        'linear_total_time_sd': linear_sd,
+    }
+
+    if tick is not None:
+        ticks = tick_align_batch(total_time, detonation_time, *tick)
+        launch_ticks, counts = np.unique(ticks['launch_tick'], return_counts=True)
+        result['tick_launch'] = [
+            {'launch_tick': int(launch_tick), 'launch_time': tick[1] % tick[0] + int(launch_tick) * tick[0],
+             'probability': count / samples}
+            for launch_tick, count in zip(launch_ticks, counts)]
+    return result
@@ -0,0 +1,210 @@
+"""
+Golden vectors that keep the browser solver (static/js/warp_engine.js) in
+parity with warp_engine.py.
+
+The vectors file holds a fixed set of targets (long and short warps,
+sub-kilometer warps, detonation times longer than the warp, values that
+round on an exact half) with the Python engine's results: phase times and
+distances, launch timing, position/speed/remaining at sample times, and
+the display strings of the /calculate response.
+
+    python warp_vectors.py build [path]    regenerate from warp_engine.py
+    python warp_vectors.py check [path]    compare Python and, when node is
+                                           installed, the JS engine against it
+
+Regenerate only when the model changes on purpose, and update the JS port
+in the same change.
+"""
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+
+from response_formats import text_calculation
+from warp_engine import AU_IN_M, WarpProfile
+
+VECTORS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'warp_vectors.json')
+JS_ENGINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'js', 'warp_engine.js')
+VECTORS_VERSION = 1
+
+RANDOM_CASES = 150
+# Numbers may differ by a few ulps between libm and V8's Math.exp/log
+RELATIVE_TOLERANCE = 1e-9
+ABSOLUTE_TOLERANCE = 1e-6
+
+PROFILE_FIELDS = ('total_time', 'peak_speed', 'accel_time', 'accel_dist', 'cruise_time', 'cruise_dist',
+                  'decel_time', 'decel_dist')
+LAUNCH_FIELDS = ('launch_time', 'distance_remaining', 'current_speed')
+DISPLAY_SECTIONS = ('target_info', 'warp_time', 'bomb_timing')
+
+# Fixed edge cases: [distance AU, warp speed AU/s, sub-warp speed m/s, detonation time s]
+EDGE_CASES = [
+    [1, 5, 200, 5],
+    [10, 2, 100, 5],
+    [100, 1.37, 70, 12],
+    [0.05, 8, 425, 5],
+    [0.001, 5, 200, 2.125],
+    [1e-9, 5, 200, 5],
+    [1e-12, 3, 150, 1],
+    [0.2, 3, 40, 60],
+    [2.5, 4.5, 250, 0.375],
+    [0.5, 15.625, 445, 7.5],
+]
+
+# Node script: read the vectors, solve every case with the JS engine and
+# print the results in the vectors' field names
+NODE_RUNNER = r"""
+const fs = require('fs');
+const W = require(process.argv[1]);
+const vectors = JSON.parse(fs.readFileSync(process.argv[2], 'utf8'));
+const results = vectors.cases.map(c => {
+    const [distance, warpSpeed, subwarpSpeed, detonationTime] = c.input;
+    const p = new W.WarpProfile(warpSpeed, subwarpSpeed, distance * W.AU_IN_M);
+    const launch = p.launch(detonationTime);
+    const display = W.calculate(distance, warpSpeed, subwarpSpeed, detonationTime);
+    return {
+        profile: [p.totalTime, p.peakSpeed, p.accelTime, p.accelDist, p.cruiseTime, p.cruiseDist,
+                  p.decelTime, p.decelDist],
+        launch: [launch.launchTime, launch.distanceRemaining, launch.currentSpeed],
+        samples: c.samples.map(s => [s[0], p.position(s[0]), p.speed(s[0]), p.remaining(s[0])]),
+        display: {target_info: display.target_info, warp_time: display.warp_time,
+                  bomb_timing: display.bomb_timing}
+    };
+});
+process.stdout.write(JSON.stringify(results));
+"""
+
+
+def solve_case(distance_au, warp_speed, subwarp_speed, detonation_time, times=None):
+    """
+    Python engine results for one case, in the vectors' layout
+
+    Args:
+        times: Sample times, default: points in every phase plus the launch
+            time and past landing
+    """
+    # Bypass the profile cache, which rounds the ship speeds
+    profile = WarpProfile(warp_speed, subwarp_speed, distance_au * AU_IN_M, cache=None)
+    timing = profile.launch(detonation_time)
+    if times is None:
+        times = [-1.0, 0.0, profile.accel_time / 2, profile.accel_time + profile.cruise_time / 2,
+                 profile.cruise_end + profile.decel_time / 3, timing.launch_time, profile.total_time,
+                 profile.total_time + 1]
+    display = text_calculation(distance_au, warp_speed, subwarp_speed, detonation_time, profile, timing)
+    return {
+        'input': [distance_au, warp_speed, subwarp_speed, detonation_time],
+        'profile': [getattr(profile, field) for field in PROFILE_FIELDS],
+        'launch': [getattr(timing, field) for field in LAUNCH_FIELDS],
+        'samples': [[t, profile.position(t), profile.speed(t), profile.remaining(t)] for t in times],
+        'display': {section: display[section] for section in DISPLAY_SECTIONS},
+    }
+
+
+def build_vectors(path=VECTORS_PATH):
+    """
+    Write the vectors file from the Python engine
+
+    Returns:
+        Number of cases written
+    """
+    rng = random.Random(20240519)
+    inputs = [list(map(float, case)) for case in EDGE_CASES]
+    for _ in range(RANDOM_CASES):
+        inputs.append([
+            round(10 ** rng.uniform(-4, 2), rng.choice((2, 4, 6))),
+            round(rng.uniform(1.2, 16), rng.choice((1, 2, 3))),
+            float(rng.randrange(40, 600, 5)),
+            rng.choice((1.0, 2.5, 5.0, 7.5, 10.0, rng.uniform(0.5, 20))),
+        ])
+    vectors = {
+        'version': VECTORS_VERSION,
+        'fields': {'input': ['distance', 'warp_speed', 'subwarp_speed', 'detonation_time'],
+                   'profile': list(PROFILE_FIELDS), 'launch': list(LAUNCH_FIELDS),
+                   'samples': ['time', 'position', 'speed', 'remaining']},
+        'cases': [solve_case(*case) for case in inputs],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(vectors, f, separators=(',', ':'))
+        f.write('\n')
+    return len(inputs)
+
+
+def compare(expected, actual):
+    """
+    Mismatches between one expected case and an engine's results
+
+    Returns:
+        List of messages, empty when the case matches
+    """
+    problems = []
+    for part in ('profile', 'launch', 'samples'):
+        want, got = expected[part], actual[part]
+        if part == 'samples':
+            want = [value for row in want for value in row]
+            got = [value for row in got for value in row]
+        if len(want) != len(got):
+            problems.append(f'{part}: expected {len(want)} values, got {len(got)}')
+        for i, (a, b) in enumerate(zip(want, got)):
+            if not math.isclose(a, b, rel_tol=RELATIVE_TOLERANCE, abs_tol=ABSOLUTE_TOLERANCE):
+                problems.append(f'{part}[{i}]: expected {a!r}, got {b!r}')
+    for section in DISPLAY_SECTIONS:
+        for key, text in expected['display'][section].items():
+            if actual['display'][section].get(key) != text:
+                problems.append(f"display.{section}.{key}: expected {text!r}, "
+                                f"got {actual['display'][section].get(key)!r}")
+    return problems
+
+
+def check_results(cases, results, engine):
+    """
+    Print mismatches for one engine
+
+    Returns:
+        Number of failing cases
+    """
+    failures = 0
+    for case, result in zip(cases, results):
+        problems = compare(case, result)
+        if problems:
+            failures += 1
+            print(f'{engine} {case["input"]}:')
+            for problem in problems:
+                print(f'  {problem}')
+    print(f'{engine}: {len(cases) - failures}/{len(cases)} cases match')
+    return failures
+
+
+def check_vectors(path=VECTORS_PATH):
+    """
+    Check the Python and JS engines against the vectors file
+
+    Returns:
+        Number of failing cases across both engines
+    """
+    with open(path, encoding='utf-8') as f:
+        cases = json.load(f)['cases']
+
+    python_results = [solve_case(*case['input'], times=[sample[0] for sample in case['samples']])
+                      for case in cases]
+    failures = check_results(cases, python_results, 'python')
+
+    node = shutil.which('node')
+    if node is None:
+        print('js: skipped (node not found)')
+        return failures
+    output = subprocess.run([node, '-e', NODE_RUNNER, JS_ENGINE_PATH, path],
+                            check=True, capture_output=True, text=True).stdout
+    return failures + check_results(cases, json.loads(output), 'js')
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] not in ('build', 'check'):
+        sys.exit('usage: python warp_vectors.py build|check [path]')
+    vectors_path = sys.argv[2] if len(sys.argv) > 2 else VECTORS_PATH
+    if sys.argv[1] == 'build':
+        print(f'Wrote {build_vectors(vectors_path)} cases to {vectors_path}')
+    elif check_vectors(vectors_path):
+        sys.exit(1)
@@ -1,52 +1,130 @@
 import math
 import json
-from flask import Flask, render_template, request, jsonify
+import os
+import time
+import numpy as np
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+from werkzeug.exceptions import BadRequest, HTTPException
+
+from countdown import Countdown, CountdownRegistry
+from timer_sessions import DEFAULT_WAIT, MAX_WAIT, SessionStore, TimerSession
+from fleet_plan import DEFAULT_RELOAD_TIME, MAX_PLAN_PAIRS, plan_fleet
+from warp_batch import BATCH_DEFAULTS, MAX_BATCH_ROWS, parse_batch_row
+from batch_requests import BATCH_FORMATS, batch_body, batch_targets, record_invalid_rows
+from metrics import ERRORS, REGISTRY, REQUEST_SECONDS, REQUESTS, STAGE_SECONDS, Gauge
+from warp_engine import AU_IN_M, DEFAULT_TICK_LENGTH, PROFILE_CACHE, WarpProfile
+from ship_catalog import load_catalog
+from response_formats import NUMERIC_JSON, negotiate, numeric_calculation, text_calculation
+from warp_inverse import distance_window, warp_speed_window
+from warp_uncertainty import DEFAULT_PERCENTILES, DEFAULT_SAMPLES, MAX_SAMPLES, InputDistribution, launch_uncertainty
+from warp_uncertainty import INPUTS as UNCERTAIN_INPUTS
+from warp_trajectory import (DEFAULT_TOLERANCE, DEFAULT_TRAJECTORY_POINTS, MAX_TRAJECTORY_POINTS, phase_boundaries,
+                             sample_trajectory)
+# Re-exported for code that imported the solver from this module
+from warp_engine import calculate_time_in_warp, calculate_distance_remaining  # noqa: F401
 
 app = Flask(__name__)
 
-# Constants
-AU_IN_M = 149597870700  # Astronomical Unit in meters
+# Named ship classes, with every hull's warp phases computed at startup
+ship_catalog = load_catalog()
+
+# Shared countdowns streamed to subscribers over Server-Sent Events
+countdowns = CountdownRegistry()
+
+# Pausable fleet timer sessions (persisted when TICKBOMB_SESSION_DB is set)
+sessions = SessionStore()
+
+# /metrics is only served to loopback clients unless this is set
+METRICS_PUBLIC = os.environ.get('TICKBOMB_METRICS_PUBLIC') == '1'
+
+REGISTRY.register(Gauge(
+    'tickbomb_profile_cache', 'Ship profile cache counters', ('field',),
+    lambda: {(field,): value for field, value in PROFILE_CACHE.stats().items()}))
+REGISTRY.register(Gauge(
+    'tickbomb_ship_catalog_cache', 'Ship catalog profile cache counters', ('field',),
+    lambda: {(field,): value for field, value in ship_catalog.cache.stats().items()}))
+REGISTRY.register(Gauge(
+    'tickbomb_timer_sessions', 'Timer sessions by state and waiting clients', ('state',),
+    lambda: {(state,): value for state, value in sessions.stats().items()}))
+
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
 
-def calculate_time_in_warp(max_warp_speed, max_subwarp_speed, warp_dist):
+@app.after_request
+def record_request(response):
+    start = g.get('request_start')
+    if start is not None:
+        endpoint = request.endpoint or 'unknown'
+        REQUEST_SECONDS.observe(time.perf_counter() - start, endpoint)
+        REQUESTS.inc(endpoint, response.status_code)
+    return response
+
+def error_kind(e):
     """
-    Calculate the time and distance parameters for a warp in EVE Online.
+    Bounded error category for an exception raised while handling a request
     """
-    k_accel = max_warp_speed
-    k_decel = min(max_warp_speed / 3, 2)
-    warp_dropout_speed = min(max_subwarp_speed / 2, 100)
-    max_ms_warp_speed = max_warp_speed * AU_IN_M
-
-    # Calculate acceleration time and distance
-    accel_time = math.log(max_ms_warp_speed / k_accel) / k_accel
-    accel_dist = (max_ms_warp_speed / k_accel) * (1 - math.exp(-k_accel * accel_time))
+    if isinstance(e, BadRequest):
+        return 'invalid_json'
+    if isinstance(e, HTTPException) and 400 <= (e.code or 500) < 500:
+        # Werkzeug's other client errors, e.g. a body that isn't JSON at all
+        return 'invalid_json' if e.code in (413, 415) else 'invalid_input'
+    if isinstance(e, (ValueError, TypeError, AttributeError, KeyError)):
+        return 'invalid_input'
+    return 'internal'
 
-    # Calculate deceleration time and distance
-    decel_time = math.log(max_ms_warp_speed / warp_dropout_speed) / k_decel
-    decel_dist = (max_ms_warp_speed / k_decel) * (1 - math.exp(-k_decel * decel_time))
+def error_response(kind, message, status=200):
+    """
+    Count an error and build its JSON response
+    """
+    ERRORS.inc(request.endpoint or 'unknown', kind)
+    return jsonify({'error': message, 'kind': kind}), status
 
-    # Calculate cruise distance and time
-    minimum_dist = accel_dist + decel_dist
-    cruise_dist = max(0, warp_dist - minimum_dist)
-    cruise_time = cruise_dist / max_ms_warp_speed if max_ms_warp_speed > 0 else 0
+def exception_response(e):
+    """
+    error_response() for an exception raised in a view; werkzeug client
+    errors keep their 4xx status
+    """
+    status = e.code if isinstance(e, HTTPException) and 400 <= (e.code or 500) < 500 else 200
+    return error_response(error_kind(e), str(e), status)
 
-    total_time = accel_time + cruise_time + decel_time
+def parse_tick(data):
+    """
+    Tick grid from a request's optional 'tick': {'length', 'offset'} object
     
-    return total_time, accel_time, cruise_time, decel_time, accel_dist, cruise_dist, decel_dist, k_accel, k_decel, max_ms_warp_speed
+    Returns:
+        (tick_length, tick_offset), or None when tick mode wasn't requested
+    """
+    tick = data.get('tick') if isinstance(data, dict) else None
+    if tick is None:
+        return None
+    if not isinstance(tick, dict):
+        raise ValueError("'tick' must be an object with 'length' and 'offset'.")
+    tick_length = float(tick.get('length', DEFAULT_TICK_LENGTH))
+    tick_offset = float(tick.get('offset', 0.0))
+    if not (math.isfinite(tick_length) and tick_length > 0 and math.isfinite(tick_offset)):
+        raise ValueError('Tick length must be greater than zero.')
+    return tick_length, tick_offset
 
-def calculate_distance_remaining(time_left, k_decel, max_ms_warp_speed, warp_dropout_speed, decel_dist):
+def all_positive(*values):
     """
-    Calculate how much distance will be covered in the remaining time
+    Whether every value is a finite number greater than zero
     """
-    if time_left <= 0:
-        return 0
-    
-    # Check if we're in deceleration phase for the entire remaining time
-    if time_left >= math.log(max_ms_warp_speed / warp_dropout_speed) / k_decel:
-        return decel_dist  # Shouldn't happen since we're calculating for the end of warp
+    return all(math.isfinite(value) and value > 0 for value in values)
+
+def parse_ship(data):
+    """
+    Target ship speeds from a request: a catalog 'ship' name (with an
+    optional 'fit') or raw 'warp_speed' and 'subwarp_speed'
     
-    # Distance covered during deceleration phase
-    distance = (max_ms_warp_speed / k_decel) * (1 - math.exp(-k_decel * time_left))
-    return distance
+    Returns:
+        (warp_speed, subwarp_speed, ShipClass or None, profile cache to use)
+    """
+    hull = data.get('ship')
+    if hull is None or hull == '':
+        return float(data.get('warp_speed', 5)), float(data.get('subwarp_speed', 200)), None, PROFILE_CACHE
+    ship = ship_catalog.resolve(hull, data.get('fit'))
+    return ship.warp_speed, ship.subwarp_speed, ship, ship_catalog.cache
 
 @app.route('/')
 def index():
@@ -55,74 +133,426 @@ def index():
 @app.route('/calculate', methods=['POST'])
 def calculate():
     try:
-        # Get input values from form
+        with STAGE_SECONDS.time('calculate', 'parse'):
+            # Get input values from form
+            data = request.get_json()
+            distance_au = float(data.get('distance', 1))
+            distance_m = distance_au * AU_IN_M
+            warp_speed, subwarp_speed, ship, cache = parse_ship(data)
+            detonation_time = float(data.get('detonation_time', 5))
+            tick = parse_tick(data)
+            fmt = negotiate(request.headers.get('Accept'), request.args.get('format'))
+        
+        # Validate inputs
+        if not all_positive(distance_au, warp_speed, subwarp_speed, detonation_time):
+            return error_response('validation', 'All values must be greater than zero.')
+        
+        with STAGE_SECONDS.time('calculate', 'solve'):
+            # Calculate warp parameters and launch timing
+            profile = WarpProfile(warp_speed, subwarp_speed, distance_m, cache=cache)
+            timing = profile.launch(detonation_time)
+            # Tick-aligned launch plan when a tick grid was given
+            tick_timing = profile.tick_launch(detonation_time, *tick) if tick is not None else None
+        
+        with STAGE_SECONDS.time('calculate', 'format'):
+            # Machine clients skip all display formatting
+            if fmt == 'numeric':
+                result = numeric_calculation(
+                    distance_au, warp_speed, subwarp_speed, detonation_time, profile, timing, tick_timing)
+                if ship is not None:
+                    result.update(ship=ship.hull, fit=ship.fit)
+                return Response(json.dumps(result), mimetype=NUMERIC_JSON)
+            
+            results = text_calculation(distance_au, warp_speed, subwarp_speed, detonation_time, profile, timing)
+            if ship is not None:
+                results['target_info']['ship'] = ship.hull if ship.fit is None else f"{ship.hull} ({ship.fit})"
+            if tick_timing is not None:
+                results['tick_timing'] = tick_timing.as_dict()
+            
+            return jsonify(results)
+        
+    except Exception as e:
+        return exception_response(e)
+
+# Trajectory samples per streamed chunk
+TRAJECTORY_CHUNK = 2000
+
+@app.route('/trajectory', methods=['POST'])
+def trajectory():
+    try:
+        with STAGE_SECONDS.time('trajectory', 'parse'):
+            data = request.get_json()
+            distance_au = float(data.get('distance', 1))
+            warp_speed, subwarp_speed, ship, cache = parse_ship(data)
+            detonation_time = float(data.get('detonation_time', 5))
+            points = int(data.get('points', DEFAULT_TRAJECTORY_POINTS))
+            adaptive = bool(data.get('adaptive', False))
+            tolerance = float(data.get('tolerance', DEFAULT_TOLERANCE))
+            tick = parse_tick(data)
+        
+        if not all_positive(distance_au, warp_speed, subwarp_speed, detonation_time):
+            return error_response('validation', 'All values must be greater than zero.')
+        if not 2 <= points <= MAX_TRAJECTORY_POINTS:
+            return error_response('validation', f'Points must be between 2 and {MAX_TRAJECTORY_POINTS}.')
+        if not (math.isfinite(tolerance) and tolerance > 0):
+            return error_response('validation', 'Tolerance must be greater than zero.')
+        
+        with STAGE_SECONDS.time('trajectory', 'solve'):
+            profile = WarpProfile(warp_speed, subwarp_speed, distance_au * AU_IN_M, cache=cache)
+            timing = profile.launch(detonation_time)
+            samples = sample_trajectory(profile, points, adaptive, tolerance)
+        
+        markers = {'launch': timing.launch_time, 'detonation': timing.launch_time + detonation_time,
+                   'landing': profile.total_time}
+        if tick is not None:
+            tick_timing = profile.tick_launch(detonation_time, *tick)
+            markers['tick_launch'] = tick_timing.launch_time
+            markers['tick_detonation'] = tick_timing.landing_time
+        header = {
+            'total_time': profile.total_time,
+            'travel_dist': profile.travel_dist,
+            'phases': [{'phase': name, 'start': start, 'end': end} for name, start, end in phase_boundaries(profile)],
+            'markers': markers,
+            'count': len(samples['time']),
+            'fields': list(samples.keys()),
+        }
+        
+        def generate():
+            # One JSON document, written a chunk of [time, position, remaining, speed] rows at a time
+            yield json.dumps(header)[:-1] + ', "samples": ['
+            rows = np.column_stack(list(samples.values()))
+            for start in range(0, len(rows), TRAJECTORY_CHUNK):
+                chunk = json.dumps(rows[start:start + TRAJECTORY_CHUNK].tolist())[1:-1]
+                yield chunk if start == 0 else ', ' + chunk
+            yield ']}'
+        
+        return Response(generate(), mimetype='application/json')
+        
+    except Exception as e:
+        return exception_response(e)
+
+@app.route('/uncertainty', methods=['POST'])
+def uncertainty():
+    try:
+        with STAGE_SECONDS.time('uncertainty', 'parse'):
+            data = request.get_json()
+            inputs = {name: InputDistribution(name, data.get(name, BATCH_DEFAULTS[name]))
+                      for name in UNCERTAIN_INPUTS}
+            samples = int(data.get('samples', DEFAULT_SAMPLES))
+            percentiles = tuple(float(p) for p in data.get('percentiles', DEFAULT_PERCENTILES))
+            seed = data.get('seed')
+            tick = parse_tick(data)
+        
+        if not 1 <= samples <= MAX_SAMPLES:
+            return error_response('validation', f'Samples must be between 1 and {MAX_SAMPLES}.')
+        if not percentiles or list(percentiles) != sorted(percentiles) or not 0 <= percentiles[0] <= percentiles[-1] <= 100:
+            return error_response('validation', 'Percentiles must be sorted values between 0 and 100.')
+        
+        with STAGE_SECONDS.time('uncertainty', 'solve'):
+            result = launch_uncertainty(inputs, samples, percentiles, tick, None if seed is None else int(seed))
+        with STAGE_SECONDS.time('uncertainty', 'format'):
+            return jsonify(result)
+        
+    except Exception as e:
+        return exception_response(e)
+
+@app.route('/inverse', methods=['POST'])
+def inverse():
+    try:
         data = request.get_json()
-        distance_au = float(data.get('distance', 1))
-        distance_m = distance_au * AU_IN_M
-        warp_speed = float(data.get('warp_speed', 5))
+        solve_for = data.get('solve_for', 'distance')
+        detonation_time = float(data.get('detonation_time', 5))
         subwarp_speed = float(data.get('subwarp_speed', 200))
+        min_launch_time = float(data.get('min_launch_time', 0))
+        max_launch_time = float(data.get('max_launch_time', math.inf))
+        tick = parse_tick(data)
+        
+        if (not all_positive(detonation_time, subwarp_speed) or not 0 <= min_launch_time < math.inf
+                or math.isnan(max_launch_time) or max_launch_time < min_launch_time):
+            return error_response('validation', 'Detonation time and speeds must be greater than zero and the launch window must be non-empty.')
+        
+        window = {'min_launch_time': min_launch_time, 'max_launch_time': max_launch_time, 'tick': tick}
+        
+        if solve_for == 'distance':
+            # One ship, or a whole table of ships in one call
+            ships = data.get('ships') or [{'warp_speed': data.get('warp_speed', 5), 'subwarp_speed': subwarp_speed}]
+            if not isinstance(ships, list):
+                return error_response('validation', "'ships' must be an array of ship objects.")
+            results = []
+            for ship in ships:
+                # A bad entry fails on its own, like a bad batch row
+                if not isinstance(ship, dict):
+                    results.append({'error': 'Ship must be an object.'})
+                    continue
+                try:
+                    warp_speed = float(ship.get('warp_speed', 5))
+                    ship_subwarp = float(ship.get('subwarp_speed', subwarp_speed))
+                except (TypeError, ValueError) as e:
+                    results.append({'error': str(e)})
+                    continue
+                if not all_positive(warp_speed, ship_subwarp):
+                    results.append({'error': 'All values must be greater than zero.'})
+                    continue
+                intervals = distance_window(warp_speed, ship_subwarp, detonation_time, **window)
+                results.append(dict(ship, distance_au=[list(interval) for interval in intervals]))
+            return jsonify({'solve_for': 'distance', 'results': results})
+        
+        if solve_for == 'warp_speed':
+            distance_au = float(data.get('distance', 1))
+            if not all_positive(distance_au):
+                return error_response('validation', 'All values must be greater than zero.')
+            intervals = warp_speed_window(distance_au, subwarp_speed, detonation_time, **window)
+            return jsonify({'solve_for': 'warp_speed', 'warp_speed': [list(interval) for interval in intervals]})
+        
+        return error_response('validation', "solve_for must be 'distance' or 'warp_speed'.")
+        
+    except Exception as e:
+        return exception_response(e)
+
+@app.route('/calculate/batch', methods=['POST'])
+def calculate_batch():
+    try:
+        data = request.get_json()
+        rows, message = batch_targets(data)
+        if message is not None:
+            return error_response('validation', message)
+        tick = parse_tick(data)
+        fmt = negotiate(request.headers.get('Accept'), request.args.get('format'), BATCH_FORMATS)
+        
+        body, mimetype, invalid = batch_body(rows, tick, fmt)
+        record_invalid_rows(invalid)
+        return Response(body, mimetype=mimetype)
+        
+    except Exception as e:
+        return exception_response(e)
+
+@app.route('/ships')
+def ships():
+    # Prefix search over the catalog, e.g. /ships?q=mal or /ships?group=Battleship
+    return jsonify({'ships': ship_catalog.search(request.args.get('q', ''), request.args.get('group'))})
+
+@app.route('/countdown', methods=['POST'])
+def create_countdown():
+    try:
+        data = request.get_json()
+        distance_au = float(data.get('distance', 1))
+        warp_speed, subwarp_speed, ship, cache = parse_ship(data)
         detonation_time = float(data.get('detonation_time', 5))
+        align_alert = float(data.get('align_alert', 3))
+        bomb_alert = float(data.get('bomb_alert', 1))
         
-        # Validate inputs
-        if distance_au <= 0 or warp_speed <= 0 or subwarp_speed <= 0 or detonation_time <= 0:
-            return jsonify({'error': 'All values must be greater than zero.'})
-        
-        # Calculate warp parameters
-        (total_time, accel_time, cruise_time, decel_time, 
-         accel_dist, cruise_dist, decel_dist, 
-         k_accel, k_decel, max_ms_warp_speed) = calculate_time_in_warp(warp_speed, subwarp_speed, distance_m)
-        
-        warp_dropout_speed = min(subwarp_speed / 2, 100)
-        
-        # Calculate distance that will be covered during the detonation time
-        distance_during_detonation = calculate_distance_remaining(
-            detonation_time, k_decel, max_ms_warp_speed, warp_dropout_speed, decel_dist)
-        
-        remaining_distance_at_launch = distance_during_detonation
-        remaining_distance_au = remaining_distance_at_launch / AU_IN_M
-        
-        # Calculate when to launch (time when remaining distance equals distance covered in detonation time)
-        launch_time = total_time - detonation_time
-        
-        # Calculate current speed at launch time
-        if launch_time <= accel_time:
-            current_speed = k_accel * AU_IN_M * math.exp(k_accel * launch_time)
-        elif launch_time <= (accel_time + cruise_time):
-            current_speed = warp_speed * AU_IN_M  # Max speed
-        else:
-            time_in_decel = launch_time - accel_time - cruise_time
-            current_speed = warp_speed * AU_IN_M * math.exp(-k_decel * time_in_decel)
-        
-        # Format the results
-        results = {
-            'target_info': {
-                'warp_distance': f"{distance_au:.2f} AU ({distance_m/1000:,.0f} km)",
-                'warp_speed': f"{warp_speed} AU/s",
-                'subwarp_speed': f"{subwarp_speed} m/s",
-                'detonation_time': f"{detonation_time} seconds"
-            },
-            'warp_time': {
-                'accel_phase': f"{accel_time:.2f} seconds (distance: {accel_dist/1000:,.0f} km)",
-                'cruise_phase': f"{cruise_time:.2f} seconds (distance: {cruise_dist/1000:,.0f} km)",
-                'decel_phase': f"{decel_time:.2f} seconds (distance: {decel_dist/1000:,.0f} km)",
-                'total_time': f"{total_time:.2f} seconds"
-            },
-            'bomb_timing': {
-                'launch_time': f"{launch_time:.2f} seconds after warp start",
-                'time_before_landing': f"{detonation_time:.2f} seconds before landing",
-                'distance_remaining': f"{remaining_distance_au:.4f} AU ({remaining_distance_at_launch/1000:,.0f} km)",
-                'current_speed': f"{current_speed:,.0f} m/s ({current_speed/AU_IN_M:.2f} AU/s)"
-            },
-            'countdown': {
-                'total_time': total_time,
-                'launch_time': launch_time
-            }
-        }
+        if not all_positive(distance_au, warp_speed, subwarp_speed, detonation_time):
+            return error_response('validation', 'All values must be greater than zero.')
+        
+        profile = WarpProfile(warp_speed, subwarp_speed, distance_au * AU_IN_M, cache=cache)
+        timing = profile.launch(detonation_time)
+        countdown = countdowns.add(Countdown(profile, timing.launch_time, align_alert, bomb_alert))
+        return jsonify(countdown.describe())
+        
+    except Exception as e:
+        return exception_response(e)
+
+@app.route('/countdown/<countdown_id>')
+def get_countdown(countdown_id):
+    countdown = countdowns.get(countdown_id)
+    if countdown is None:
+        return error_response('not_found', 'Countdown not found.', 404)
+    return jsonify(countdown.describe())
+
+# Served natively by asgi_app in production; this streaming route holds a
+# worker per subscriber and is meant for the dev server
+@app.route('/countdown/<countdown_id>/events')
+def countdown_events(countdown_id):
+    countdown = countdowns.get(countdown_id)
+    if countdown is None:
+        return error_response('not_found', 'Countdown not found.', 404)
+    return Response(stream_with_context(countdown.stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/countdown/<countdown_id>/stop', methods=['POST'])
+def stop_countdown(countdown_id):
+    if countdowns.stop(countdown_id) is None:
+        return error_response('not_found', 'Countdown not found.', 404)
+    return jsonify({'id': countdown_id, 'stopped': True})
+
+@app.route('/time')
+def server_time():
+    # Clock-offset probe: the client sends its own clock as 'client_time'
+    # and estimates offset = ((receive - sent) + (send - received)) / 2
+    receive = time.time()
+    client_time = request.args.get('client_time', type=float)
+    return jsonify({'client_time': client_time, 'receive': receive, 'send': time.time()})
+
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    try:
+        data = request.get_json()
+        distance_au = float(data.get('distance', 1))
+        warp_speed, subwarp_speed, ship, cache = parse_ship(data)
+        detonation_time = float(data.get('detonation_time', 5))
+        align_alert = float(data.get('align_alert', 3))
+        bomb_alert = float(data.get('bomb_alert', 1))
+        paused = bool(data.get('paused', False))
+        
+        if not all_positive(distance_au, warp_speed, subwarp_speed, detonation_time):
+            return error_response('validation', 'All values must be greater than zero.')
         
-        return jsonify(results)
+        profile = WarpProfile(warp_speed, subwarp_speed, distance_au * AU_IN_M, cache=cache)
+        timing = profile.launch(detonation_time)
+        target = {'distance': distance_au, 'warp_speed': warp_speed, 'subwarp_speed': subwarp_speed,
+                  'detonation_time': detonation_time}
+        if ship is not None:
+            target.update(ship=ship.hull, fit=ship.fit)
+        session = sessions.add(TimerSession(target, profile.total_time, timing.launch_time,
+                                            align_alert, bomb_alert, paused))
+        # The control token is only ever sent to the session's creator
+        return jsonify(dict(session.snapshot(), token=session.token))
         
     except Exception as e:
-        return jsonify({'error': str(e)})
+        return exception_response(e)
+
+@app.route('/sessions/<session_id>')
+def get_session(session_id):
+    # With ?version=N, wait up to ?wait seconds for a newer version
+    version = request.args.get('version', type=int)
+    if version is None:
+        session = sessions.get(session_id)
+    else:
+        wait = request.args.get('wait', DEFAULT_WAIT, type=float)
+        if not math.isfinite(wait):
+            return error_response('invalid_input', 'wait must be a finite number of seconds')
+        wait = min(max(wait, 0), MAX_WAIT)
+        session = sessions.wait(session_id, version, wait)
+    if session is None:
+        return error_response('not_found', 'Session not found.', 404)
+    return jsonify(session.snapshot())
+
+@app.route('/sessions/<session_id>/<action>', methods=['POST'])
+def control_session(session_id, action):
+    if action not in ('pause', 'resume', 'stop'):
+        return error_response('not_found', 'Unknown session action.', 404)
+    data = request.get_json(silent=True) or {}
+    try:
+        session = sessions.control(session_id, data.get('token'), action)
+    except PermissionError as e:
+        return error_response('forbidden', str(e), 403)
+    except ValueError as e:
+        return error_response('conflict', str(e), 409)
+    if session is None:
+        return error_response('not_found', 'Session not found.', 404)
+    return jsonify(session.snapshot())
+
+@app.route('/plan', methods=['POST'])
+def plan():
+    try:
+        with STAGE_SECONDS.time('plan', 'parse'):
+            data = request.get_json()
+        targets = data.get('targets')
+        bombers = data.get('bombers')
+        if not isinstance(targets, list) or not isinstance(bombers, list):
+            return error_response('validation', "Expected 'targets' and 'bombers' arrays.")
+        if len(targets) > MAX_BATCH_ROWS or len(bombers) > MAX_BATCH_ROWS:
+            return error_response('validation', f'At most {MAX_BATCH_ROWS} targets and bombers per plan.')
+        reload_time = float(data.get('reload_time', DEFAULT_RELOAD_TIME))
+        min_launch_time = float(data.get('min_launch_time', 0))
+        tick = parse_tick(data)
+        
+        errors = []
+        
+        # Targets: same fields as a batch row, detonation time comes from the bomber
+        target_ids = []
+        target_rows = []
+        target_index = {}
+        for i, target in enumerate(targets):
+            try:
+                if not isinstance(target, dict):
+                    raise ValueError('Target must be an object.')
+                row = parse_batch_row(dict(target, detonation_time=1))
+                target_id = target.get('id', i)
+                # Bombers refer to targets by id, so ids must be usable as keys and unique
+                if isinstance(target_id, bool) or not isinstance(target_id, (str, int)):
+                    raise ValueError('Target id must be a string or an integer.')
+                if target_id in target_index:
+                    raise ValueError(f'Duplicate target id: {target_id!r}')
+            except (TypeError, ValueError) as e:
+                errors.append({'target': i, 'error': str(e)})
+                continue
+            target_index[target_id] = len(target_ids)
+            target_ids.append(target_id)
+            target_rows.append(row[:3])
+        
+        # Bombers and the targets each one is assigned to (all by default)
+        bomber_ids = []
+        detonation_times = []
+        pair_target = []
+        pair_bomber = []
+        for i, bomber in enumerate(bombers):
+            try:
+                if not isinstance(bomber, dict):
+                    raise ValueError('Bomber must be an object.')
+                detonation_time = float(bomber.get('detonation_time', 5))
+                if not (math.isfinite(detonation_time) and detonation_time > 0):
+                    raise ValueError('Detonation time must be greater than zero.')
+                assigned = bomber.get('targets')
+                if assigned is None:
+                    assigned_index = range(len(target_ids))
+                else:
+                    if not isinstance(assigned, list):
+                        raise ValueError("'targets' must be an array of target ids.")
+                    unknown = [target_id for target_id in assigned if target_id not in target_index]
+                    if unknown:
+                        raise ValueError(f'Unknown targets: {unknown}')
+                    assigned_index = [target_index[target_id] for target_id in assigned]
+            except (TypeError, ValueError) as e:
+                errors.append({'bomber': i, 'error': str(e)})
+                continue
+            bomber_number = len(bomber_ids)
+            bomber_ids.append(bomber.get('id', i))
+            detonation_times.append(detonation_time)
+            pair_target.extend(assigned_index)
+            pair_bomber.extend([bomber_number] * len(assigned_index))
+        
+        if len(pair_target) > MAX_PLAN_PAIRS:
+            return error_response('validation', f'At most {MAX_PLAN_PAIRS} target/bomber pairs per plan.')
+        if not pair_target:
+            return jsonify({'schedule': [], 'conflicts': 0, 'errors': errors})
+        
+        with STAGE_SECONDS.time('plan', 'solve'):
+            columns = list(zip(*target_rows))
+            planned = plan_fleet(columns[0], columns[1], columns[2], detonation_times, pair_target, pair_bomber,
+                                 reload_time=reload_time, min_launch_time=min_launch_time, tick=tick)
+        
+        with STAGE_SECONDS.time('plan', 'format'):
+            schedule = []
+            for target, bomber, launch_time, landing_time, detonation_time, out_of_range, bomb_overlap in zip(
+                    planned['target'].tolist(), planned['bomber'].tolist(), planned['launch_time'].tolist(),
+                    planned['landing_time'].tolist(), planned['detonation_time'].tolist(),
+                    planned['out_of_range'].tolist(), planned['bomb_overlap'].tolist()):
+                conflicts = []
+                if out_of_range:
+                    conflicts.append('out_of_range')
+                if bomb_overlap:
+                    conflicts.append('bomb_overlap')
+                schedule.append({
+                    'target': target_ids[target],
+                    'bomber': bomber_ids[bomber],
+                    'launch_time': launch_time,
+                    'landing_time': landing_time,
+                    'detonation_time': detonation_time,
+                    'conflicts': conflicts,
+                })
+            
+            conflict_count = int((planned['out_of_range'] | planned['bomb_overlap']).sum())
+            return jsonify({'schedule': schedule, 'conflicts': conflict_count, 'errors': errors})
+        
+    except Exception as e:
+        return exception_response(e)
+
+@app.route('/metrics')
+def metrics():
+    if not METRICS_PUBLIC and request.remote_addr not in ('127.0.0.1', '::1'):
+        return error_response('forbidden', 'Metrics are only available locally.', 403)
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5000, debug=True, threaded=True)
\ No newline at end of file